@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Cross-domain shared-capability index
+
+All domains are loaded into one interned label vocabulary and indexed by
+(level, normalized label), so capabilities that recur across domains fall
+into the same bucket in a single pass instead of comparing every pair of
+domains. Each node also gets a subtree hash over the normalized labels
+below it, which separates clusters whose whole subtree is identical from
+ones that only share a name.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+
+from domain_config import DOMAINS_DIR, list_domains
+from query_matcher import stem_word, tokenize
+from reachability_index import strongly_connected_components
+from validate_domains import extract_nodes_from_file
+
+DEFAULT_MIN_DOMAINS = 2
+DEFAULT_TOP = 20
+
+
+def normalize_label(label):
+    """Stemmed tokens with punctuation and stop words removed"""
+    return ' '.join(stem_word(token) for token in tokenize(label))
+
+
+def _is_shared(node_id):
+    return '-shared' in node_id or '-unified' in node_id
+
+
+def subtree_hashes(nodes, label_ids):
+    """Hash of each node's level, label and everything below it
+
+    Only nodes in label_ids are hashed. Hashes are built over the strongly
+    connected components of the children graph, so every node on a cycle
+    hashes the same cycle wherever a traversal would have entered it.
+    """
+    ids = list(label_ids)
+    position = {node_id: i for i, node_id in enumerate(ids)}
+    successors = [
+        [position[c] for c in nodes[node_id].get('children', []) if c in position]
+        for node_id in ids
+    ]
+    component, count = strongly_connected_components(len(ids), successors)
+    members = [[] for _ in range(count)]
+    for v in range(len(ids)):
+        members[component[v]].append(v)
+
+    def own(v):
+        return f"{nodes[ids[v]].get('level')}\0{label_ids[ids[v]]}"
+
+    hashes = {}
+    # Tarjan numbers components in reverse topological order, so every
+    # child outside a component is hashed before the component itself
+    for c in range(count):
+        inside = members[c]
+        below = sorted(hashes[ids[w]] for v in inside for w in successors[v] if component[w] != c)
+        if len(inside) == 1 and inside[0] not in successors[inside[0]]:
+            v = inside[0]
+            hashes[ids[v]] = hashlib.sha1(f"{own(v)}\0{','.join(below)}".encode('utf-8')).hexdigest()
+            continue
+        cycle = hashlib.sha1(
+            f"cycle\0{'|'.join(sorted(own(v) for v in inside))}\0{','.join(below)}".encode('utf-8')
+        ).hexdigest()
+        for v in inside:
+            hashes[ids[v]] = hashlib.sha1(f"{own(v)}\0{cycle}".encode('utf-8')).hexdigest()
+    return hashes
+
+
+class CapabilityIndex:
+    """Global (level, label) and subtree-hash index over many domains"""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.labels = []
+        self.display = {}
+        self.by_label = defaultdict(list)
+        self.by_subtree = defaultdict(list)
+        self.domains = []
+
+    def intern(self, label):
+        label_id = self.vocabulary.get(label)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.vocabulary[label] = label_id
+            self.labels.append(label)
+        return label_id
+
+    def add_domain(self, domain_name, nodes):
+        """Index a domain's nodes; shared/unified rollups and products are skipped"""
+        self.domains.append(domain_name)
+        label_ids = {}
+        for node_id, node in nodes.items():
+            if node.get('level') == 'product' or _is_shared(node_id):
+                continue
+            label_ids[node_id] = self.intern(normalize_label(node.get('label', '')))
+            self.display.setdefault(label_ids[node_id], node.get('label', ''))
+        hashes = subtree_hashes(nodes, label_ids)
+
+        for node_id in label_ids:
+            node = nodes[node_id]
+            entry = (domain_name, node_id, tuple(node.get('products', [])))
+            self.by_label[(node.get('level'), label_ids[node_id])].append(entry)
+            if node.get('children'):
+                self.by_subtree[hashes[node_id]].append(entry)
+
+    def clusters(self, min_domains=DEFAULT_MIN_DOMAINS, level=None):
+        """Label clusters spanning at least min_domains domains, widest first"""
+        subtree_of = {}
+        for digest, entries in self.by_subtree.items():
+            for domain_name, node_id, _ in entries:
+                subtree_of[(domain_name, node_id)] = digest
+
+        results = []
+        for (node_level, label_id), entries in self.by_label.items():
+            if level and node_level != level:
+                continue
+            domains = sorted({domain_name for domain_name, _, _ in entries})
+            if len(domains) < min_domains:
+                continue
+            coverage = defaultdict(set)
+            for domain_name, _, products in entries:
+                coverage[domain_name].update(products)
+            # Cross-domain groups of nodes whose whole subtree matches
+            identical = defaultdict(list)
+            for domain_name, node_id, _ in entries:
+                digest = subtree_of.get((domain_name, node_id))
+                if digest:
+                    identical[digest].append((domain_name, node_id))
+            identical_groups = [
+                members for members in identical.values()
+                if len({domain_name for domain_name, _ in members}) >= min_domains
+            ]
+            results.append({
+                'level': node_level,
+                'label': self.display[label_id],
+                'normalized': self.labels[label_id],
+                'size': len(entries),
+                'domains': domains,
+                'products': {domain_name: sorted(products) for domain_name, products in sorted(coverage.items())},
+                'nodes': [f'{domain_name}:{node_id}' for domain_name, node_id, _ in entries],
+                'identical_subtrees': [[f'{d}:{n}' for d, n in members] for members in identical_groups],
+            })
+        results.sort(key=lambda c: (-len(c['domains']), -c['size'], c['level'] or '', c['label']))
+        return results
+
+
+def build_capability_index(domains=None, load=None):
+    """Index the given domains (default: all); load(domain) -> nodes overrides parsing"""
+    index = CapabilityIndex()
+    for domain_name in domains or list_domains():
+        if load:
+            nodes = load(domain_name)
+        else:
+            nodes = extract_nodes_from_file(os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts'))
+        index.add_domain(domain_name, nodes)
+    return index
+
+
+def report_capabilities(index, min_domains=DEFAULT_MIN_DOMAINS, level=None, top=DEFAULT_TOP):
+    """Print cross-domain capability clusters; returns them"""
+    clusters = index.clusters(min_domains, level)
+    entries = sum(len(e) for e in index.by_label.values())
+    print(f"Indexed {entries} nodes from {len(index.domains)} domains, {len(index.labels)} distinct labels")
+    print(f"{len(clusters)} capabilities appear in {min_domains}+ domains")
+
+    by_level = defaultdict(int)
+    for cluster in clusters:
+        by_level[cluster['level']] += 1
+    for node_level in ['workflow', 'outcome', 'scenario', 'step', 'action']:
+        if by_level[node_level]:
+            print(f"  {node_level.capitalize()}s: {by_level[node_level]}")
+
+    for cluster in clusters[:top]:
+        products = '; '.join(f"{d}: {', '.join(p) or '-'}" for d, p in cluster['products'].items())
+        print(f"\n  '{cluster['label']}' ({cluster['level']}) - {cluster['size']} nodes in {len(cluster['domains'])} domains")
+        print(f"    Products: {products}")
+        for members in cluster['identical_subtrees']:
+            print(f"    ✓ Identical subtrees: {', '.join(members)}")
+    if len(clusters) > top:
+        print(f"\n  ... and {len(clusters) - top} more")
+    return clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find capabilities duplicated across domains')
+    parser.add_argument('domains', nargs='*', help='Domains to index (default: all)')
+    parser.add_argument('--min-domains', type=int, default=DEFAULT_MIN_DOMAINS,
+                        help=f'Report labels found in at least this many domains (default: {DEFAULT_MIN_DOMAINS})')
+    parser.add_argument('--level', help='Only report clusters at this level')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Clusters to print (default: {DEFAULT_TOP})')
+    parser.add_argument('--json', help='Write all clusters to this file')
+    args = parser.parse_args()
+
+    domains = []
+    for domain in args.domains or list_domains():
+        if not os.path.exists(os.path.join(DOMAINS_DIR, domain, 'nodes.ts')):
+            print(f"⚠️  Unknown domain: {domain}")
+            continue
+        domains.append(domain)
+
+    print("=" * 60)
+    print("CROSS-DOMAIN CAPABILITIES")
+    print("=" * 60)
+
+    clusters = report_capabilities(build_capability_index(domains), args.min_domains, args.level, args.top)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(clusters, f, indent=2)
+        print(f"\nWritten: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Locate domain configs and parse domain.ts tables and queries.ts from them"""
+
+import os
+import re
+
+DOMAINS_DIR = 'src/config/domains'
+
+STRING_RE = re.compile(r"""'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)\"""")
+
+
+def list_domains():
+    """List domain names that have a nodes.ts file"""
+    if not os.path.isdir(DOMAINS_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(DOMAINS_DIR)
+        if os.path.exists(os.path.join(DOMAINS_DIR, name, 'nodes.ts'))
+    )
+
+
+def _const_block(content, name):
+    """Lines of an `export const NAME ... = {` or `[` block, up to its closing line"""
+    start = content.find(f'export const {name}')
+    if start == -1:
+        return []
+    lines = content[start:].split('\n')
+    block = []
+    for line in lines[1:]:
+        if re.match(r'^[}\]]', line):
+            break
+        block.append(line)
+    return block
+
+
+def _strings(text):
+    """All quoted string literals in text, unescaped"""
+    return [
+        re.sub(r'\\(.)', r'\1', double if double and not single else single)
+        for single, double in STRING_RE.findall(text)
+    ]
+
+
+def extract_product_codes(content):
+    """PRODUCT_CODES = ['a', 'b'] as const"""
+    match = re.search(r"export const PRODUCT_CODES\s*=\s*\[([^\]]*)\]", content)
+    return _strings(match.group(1)) if match else []
+
+
+def extract_synonyms(content):
+    """DOMAIN_SYNONYMS: key -> list of synonyms, in file order"""
+    synonyms = {}
+    for line in _const_block(content, 'DOMAIN_SYNONYMS'):
+        match = re.match(r"""^\s*['"]?([^'":]+?)['"]?\s*:\s*\[([^\]]*)\]""", line)
+        if match:
+            synonyms[match.group(1)] = _strings(match.group(2))
+    return synonyms
+
+
+def extract_word_forms(content):
+    """WORD_FORMS: inflected form -> base form"""
+    forms = {}
+    for line in _const_block(content, 'WORD_FORMS'):
+        match = re.match(r"""^\s*['"]?([^'":]+?)['"]?\s*:\s*['"]([^'"]*)['"]""", line)
+        if match:
+            forms[match.group(1)] = match.group(2)
+    return forms
+
+
+def load_domain_tables(domain_name):
+    """Synonyms, word forms and product codes from a domain's domain.ts"""
+    path = os.path.join(DOMAINS_DIR, domain_name, 'domain.ts')
+    with open(path, 'r') as f:
+        content = f.read()
+    return {
+        'synonyms': extract_synonyms(content),
+        'word_forms': extract_word_forms(content),
+        'product_codes': extract_product_codes(content),
+    }
+
+
+def iter_queries(lines):
+    """Yield USER_QUERIES entries from queries.ts lines, one object at a time
+
+    Each query carries the 1-based line number of its opening brace.
+    """
+    in_queries = False
+    current = None
+    for number, line in enumerate(lines, 1):
+        if not in_queries:
+            in_queries = 'export const USER_QUERIES' in line
+            continue
+        stripped = line.strip()
+        if stripped.startswith('{') and current is None:
+            current = {'line': number}
+        elif stripped.startswith('}') and current is not None:
+            if 'id' in current:
+                yield current
+            current = None
+        elif stripped.startswith('];'):
+            break
+        elif current is not None:
+            match = re.match(r"""^(\w+)\s*:\s*(.*?),?$""", stripped)
+            if not match:
+                continue
+            key, value = match.groups()
+            if key in ('id', 'text', 'entryNode', 'entryLevel'):
+                strings = _strings(value)
+                if strings:
+                    current[key] = strings[0]
+            elif key in ('isDuplicate', 'isWorkflow', 'ambiguous'):
+                current[key] = value.startswith('true')
+
+
+def extract_queries_from_file(filepath):
+    with open(filepath, 'r') as f:
+        return list(iter_queries(f))
+
+
+def load_queries(domain_name):
+    return extract_queries_from_file(os.path.join(DOMAINS_DIR, domain_name, 'queries.ts'))
+
+
+def iter_context_refs(lines):
+    """Yield product and node references from SAMPLE_CONTEXTS lines
+
+    Each reference is {'line', 'context', 'kind', 'value'} where kind is
+    'history-product', 'history-node' or 'preference'.
+    """
+    in_contexts = False
+    context = None
+    section = None
+    for number, line in enumerate(lines, 1):
+        if not in_contexts:
+            in_contexts = 'export const SAMPLE_CONTEXTS' in line
+            continue
+        if re.match(r'^[}\]]', line):
+            break
+        if match := re.match(r"""^  ['"]?([\w-]+)['"]?\s*:\s*\{""", line):
+            context, section = match.group(1), None
+            continue
+        stripped = re.sub(r'\s*//.*$', '', line).strip()
+        if stripped.startswith('history:'):
+            section = 'history'
+        elif stripped.startswith('productPreferences:'):
+            section = None if stripped.rstrip(',').endswith('{}') else 'preferences'
+        elif section == 'preferences':
+            if stripped.startswith('}'):
+                section = None
+            elif match := re.match(r"""^['"]?([\w-]+)['"]?\s*:""", stripped):
+                yield {'line': number, 'context': context, 'kind': 'preference', 'value': match.group(1)}
+        elif section == 'history':
+            if stripped.startswith(']'):
+                section = None
+            elif match := re.match(r"""^(product|node)\s*:\s*(.*?),?$""", stripped):
+                strings = _strings(match.group(2))
+                if strings:
+                    yield {'line': number, 'context': context, 'kind': f'history-{match.group(1)}', 'value': strings[0]}
+
+
+def extract_context_refs_from_file(filepath):
+    with open(filepath, 'r') as f:
+        return list(iter_context_refs(f))
+
+
+def load_context_refs(domain_name):
+    return extract_context_refs_from_file(os.path.join(DOMAINS_DIR, domain_name, 'contexts.ts'))
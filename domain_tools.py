@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Single entry point for the domain tooling scripts
+
+    python3 domain_tools.py validate duplicates -d financial healthcare
+
+Runs one or more subcommands over any list of domains (default: all).
+Each subcommand's module is imported only when that subcommand runs, and
+every domain's nodes.ts is parsed once per invocation and shared by all
+subcommands.
+"""
+
+import argparse
+import os
+import sys
+
+from domain_config import DOMAINS_DIR, list_domains
+from validate_domains import extract_nodes_from_file
+
+_graph_cache = {}
+
+
+def load_nodes(domain_name):
+    """Parse a domain's nodes.ts once per invocation"""
+    if domain_name not in _graph_cache:
+        path = os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts')
+        _graph_cache[domain_name] = extract_nodes_from_file(path)
+    return _graph_cache[domain_name]
+
+
+def run_validate(domains):
+    from validate_domains import print_validation_summary, validate_domain
+
+    print("=" * 60)
+    print("DOMAIN VALIDATION TOOL")
+    print("=" * 60)
+    results = {domain: validate_domain(domain, load_nodes(domain)) for domain in domains}
+    return print_validation_summary(results)
+
+
+def run_duplicates(domains):
+    from find_duplicates import report_duplicates
+
+    for domain in domains:
+        print()
+        report_duplicates(load_nodes(domain), domain)
+    return 0
+
+
+def run_similar(domains):
+    from find_all_duplicates import report_similarity
+
+    for domain in domains:
+        print()
+        report_similarity(load_nodes(domain), domain)
+    return 0
+
+
+def run_rationalization(domains):
+    from validate_healthcare import report_rationalization
+
+    failed = 0
+    for domain in domains:
+        print()
+        if not report_rationalization(load_nodes(domain), domain):
+            failed += 1
+    return 0 if failed == 0 else 1
+
+
+def run_stream(domains):
+    from validate_stream import report_stream_validation
+
+    failed = 0
+    for domain in domains:
+        path = os.path.join(DOMAINS_DIR, domain, 'nodes.ts')
+        if not report_stream_validation(path, domain, duplicates=True):
+            failed += 1
+    return 0 if failed == 0 else 1
+
+
+def run_synonyms(domains):
+    from synonym_tables import compile_domain, report_synonym_tables
+
+    failed = 0
+    for domain in domains:
+        print()
+        if not report_synonym_tables(compile_domain(domain, load_nodes(domain))):
+            failed += 1
+    return 0 if failed == 0 else 1
+
+
+def run_paths(domains):
+    from path_counts import report_path_counts
+
+    for domain in domains:
+        print()
+        report_path_counts(load_nodes(domain), domain)
+    return 0
+
+
+def run_capabilities(domains):
+    from capability_index import build_capability_index, report_capabilities
+
+    print()
+    report_capabilities(build_capability_index(domains, load=load_nodes))
+    return 0
+
+
+COMMANDS = {
+    'validate': run_validate,
+    'duplicates': run_duplicates,
+    'similar': run_similar,
+    'rationalization': run_rationalization,
+    'stream': run_stream,
+    'synonyms': run_synonyms,
+    'paths': run_paths,
+    'capabilities': run_capabilities,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Domain validation and analysis tools')
+    parser.add_argument('commands', nargs='+', choices=list(COMMANDS), metavar='command',
+                        help=f"One or more of: {', '.join(COMMANDS)}")
+    parser.add_argument('-d', '--domains', nargs='+', metavar='DOMAIN',
+                        help='Domains to process (default: all)')
+    args = parser.parse_args(argv)
+
+    known = list_domains()
+    domains = []
+    for domain in args.domains or known:
+        if domain not in known:
+            print(f"⚠️  Unknown domain: {domain}")
+            continue
+        domains.append(domain)
+
+    status = 0
+    for command in dict.fromkeys(args.commands):
+        status = max(status, COMMANDS[command](domains))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
-"""Find ALL potential duplicate nodes across products in financial domain"""
+"""Find ALL potential duplicate nodes across products in a domain"""
 
 import re
+import sys
 from collections import defaultdict
 
 def extract_nodes_from_file(filepath):
@@ -49,8 +50,25 @@ def extract_nodes_from_file(filepath):
     
     return nodes
 
-def analyze_similarity(nodes):
+# Product-specific terms stripped from labels before grouping
+PRODUCT_TERMS = {
+    'financial': ['core banking', 'wealth', 'loans', 'payments', 'risk', 'compliance'],
+}
+
+def product_terms(nodes, domain_name):
+    """Product-specific label terms for a domain, derived from product IDs if not listed"""
+    if domain_name in PRODUCT_TERMS:
+        return PRODUCT_TERMS[domain_name]
+    return [
+        node_id.replace('product-', '').replace('-', ' ')
+        for node_id, node in nodes.items()
+        if node.get('level') == 'product'
+    ]
+
+def analyze_similarity(nodes, terms=None):
     """Analyze nodes for similar functionality that could be rationalized"""
+    if terms is None:
+        terms = PRODUCT_TERMS['financial']
     
     # Group by label similarity (not exact match)
     label_groups = defaultdict(list)
@@ -65,7 +83,7 @@ def analyze_similarity(nodes):
         # Normalize label for grouping
         # Remove product-specific terms
         normalized = label
-        for term in ['core banking', 'wealth', 'loans', 'payments', 'risk', 'compliance']:
+        for term in terms:
             normalized = normalized.replace(term, '').strip()
         
         # Common operations that might be duplicated
@@ -104,14 +122,11 @@ def analyze_similarity(nodes):
     
     return potential_duplicates
 
-def main():
-    filepath = 'src/config/domains/financial/nodes.ts'
-    
-    print("Analyzing Financial Domain for Rationalization Opportunities")
+def report_similarity(nodes, domain_name):
+    """Print exact and similar duplicate candidates for a domain"""
+    print(f"Analyzing {domain_name.capitalize()} Domain for Rationalization Opportunities")
     print("=" * 60)
     
-    nodes = extract_nodes_from_file(filepath)
-    
     if not nodes:
         print("ERROR: Could not extract nodes from file")
         return
@@ -143,7 +158,7 @@ def main():
         print("  None found")
     
     # Find similar functionality
-    potential = analyze_similarity(nodes)
+    potential = analyze_similarity(nodes, product_terms(nodes, domain_name))
     
     print("\n\n2. SIMILAR FUNCTIONALITY (could be rationalized):")
     print("-" * 40)
@@ -167,7 +182,8 @@ def main():
     print("RECOMMENDATIONS:")
     print("=" * 60)
     
-    print("\n1. Current shared nodes: 1 (step-verify-identity-shared)")
+    shared_ids = [nid for nid in nodes if '-shared' in nid or '-unified' in nid]
+    print(f"\n1. Current shared nodes: {len(shared_ids)} ({', '.join(shared_ids) or 'none'})")
     print("\n2. Consider creating shared nodes for these common patterns:")
     print("   - Document verification/validation")
     print("   - Compliance checking")
@@ -178,5 +194,11 @@ def main():
     print("   - Include union of children from all duplicates")
     print("   - Be mapped in RATIONALIZED_NODE_ALTERNATIVES")
 
+def main():
+    domains = sys.argv[1:] or ['financial']
+    for domain in domains:
+        nodes = extract_nodes_from_file(f'src/config/domains/{domain}/nodes.ts')
+        report_similarity(nodes, domain)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
-"""Find duplicate nodes in financial domain that should be rationalized"""
+"""Find duplicate nodes in a domain that should be rationalized"""
 
 import re
+import sys
 from collections import defaultdict
 
 def extract_nodes_from_file(filepath):
@@ -79,14 +80,11 @@ def find_duplicates(nodes):
     
     return duplicates
 
-def main():
-    filepath = 'src/config/domains/financial/nodes.ts'
-    
-    print("Finding Duplicate Nodes in Financial Domain")
+def report_duplicates(nodes, domain_name):
+    """Print duplicate groups and rationalization recommendations for a domain"""
+    print(f"Finding Duplicate Nodes in {domain_name.capitalize()} Domain")
     print("=" * 60)
     
-    nodes = extract_nodes_from_file(filepath)
-    
     if not nodes:
         print("ERROR: Could not extract nodes from file")
         return
@@ -136,5 +134,11 @@ def main():
             print(f"  parents: [...appropriate parent nodes...]")
             print("}")
 
+def main():
+    domains = sys.argv[1:] or ['financial']
+    for domain in domains:
+        nodes = extract_nodes_from_file(f'src/config/domains/{domain}/nodes.ts')
+        report_duplicates(nodes, domain)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""Precompute hierarchy layouts per domain and view mode
+
+Python port of the visibility/ordering logic in HierarchyVisualization.tsx and
+calculateCompactBranchLayout in src/utils/layoutCalculators.ts. Branch bounds
+are computed once per node bottom-up instead of recursively on every call, and
+results are written to layout files keyed by the domain's graph hash so the app
+can load positions instead of computing them on each toggle.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+from domain_config import DOMAINS_DIR, list_domains
+from reachability_index import graph_hash
+from validate_domains import extract_nodes_from_file
+
+LAYOUT_VERSION = 1
+DEFAULT_OUT_DIR = 'public/layouts'
+
+# Mirrors LAYOUT in src/config/theme.ts as used by HierarchyVisualization.tsx
+LAYOUT_CONFIG = {
+    'nodeWidth': 140,
+    'minNodeSpacing': 30,
+    'levelHeight': 100,
+    'margin': 50,
+    'labelMargin': 100,
+}
+
+LEVELS = ['product', 'workflow', 'outcome', 'scenario', 'step', 'action']
+NEXT_LEVEL = {
+    'product': 'outcome',
+    'outcome': 'scenario',
+    'scenario': 'step',
+    'step': 'action',
+    'action': None,
+    'workflow': None,
+}
+PARENT_LEVEL = {
+    'outcome': 'product',
+    'scenario': 'outcome',
+    'step': 'scenario',
+    'action': 'step',
+}
+
+VIEW_MODES = [
+    ('rationalization-on_workflows-shown', True, True),
+    ('rationalization-on_workflows-hidden', True, False),
+    ('rationalization-off_workflows-shown', False, True),
+    ('rationalization-off_workflows-hidden', False, False),
+]
+
+
+def _is_shared_id(node_id):
+    return '-shared' in node_id or '-unified' in node_id
+
+
+def _shared_node_id(label, level):
+    normalized = re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-')
+    return f'{level}-{normalized}-shared'
+
+
+def preprocess_domain_nodes(original_nodes):
+    """Port of preprocessDomainNodes: add generated shared nodes
+
+    Returns (nodes, duplicate_nodes, shared_nodes).
+    """
+    nodes = json.loads(json.dumps(original_nodes))
+    manual_shared = [node_id for node_id in nodes if _is_shared_id(node_id)]
+
+    groups = {}
+    for node_id, node in nodes.items():
+        if _is_shared_id(node_id) or node.get('level') == 'workflow':
+            continue
+        key = (node.get('label', '').lower(), node.get('level'))
+        if key not in groups:
+            groups[key] = {'label': node.get('label', ''), 'level': node.get('level'), 'ids': []}
+        groups[key]['ids'].append(node_id)
+
+    duplicate_nodes = []
+    shared_nodes = []
+    for group in groups.values():
+        ids = group['ids']
+        if len(ids) < 2:
+            continue
+        product_sets = [set(nodes[i].get('products', [])) for i in ids]
+        if all(s == product_sets[0] for s in product_sets[1:]):
+            continue
+
+        shared_id = _shared_node_id(group['label'], group['level'])
+        if shared_id in nodes or any(
+            nodes[m].get('label') == group['label'] and nodes[m].get('level') == group['level']
+            for m in manual_shared
+        ):
+            duplicate_nodes.extend(ids)
+            continue
+
+        children, parents, products = {}, {}, {}
+        for i in ids:
+            children.update(dict.fromkeys(nodes[i].get('children', [])))
+            parents.update(dict.fromkeys(nodes[i].get('parents', [])))
+            products.update(dict.fromkeys(nodes[i].get('products', [])))
+
+        nodes[shared_id] = {
+            'id': shared_id,
+            'label': group['label'],
+            'level': group['level'],
+            'parents': list(parents),
+            'children': list(children),
+            'products': list(products),
+        }
+        shared_nodes.append(shared_id)
+        duplicate_nodes.extend(ids)
+
+        for parent_id in parents:
+            parent = nodes.get(parent_id)
+            if parent is not None and shared_id not in parent['children']:
+                parent['children'].append(shared_id)
+        for child_id in children:
+            child = nodes.get(child_id)
+            if child is not None and shared_id not in child['parents']:
+                child['parents'].append(shared_id)
+
+    shared_nodes.extend(manual_shared)
+    return nodes, duplicate_nodes, shared_nodes
+
+
+def build_graph(nodes):
+    """Children adjacency and roots, as built by convertLegacyNodes"""
+    children = {node_id: [] for node_id in nodes}
+    has_parent = set()
+    for node_id, node in nodes.items():
+        for child_id in node.get('children', []):
+            if child_id in nodes and child_id not in children[node_id]:
+                children[node_id].append(child_id)
+                has_parent.add(child_id)
+    roots = [node_id for node_id in nodes if node_id not in has_parent]
+    return children, roots
+
+
+def collect_visible(nodes, children, roots, duplicate_nodes, shared_nodes,
+                    show_rationalized, show_workflows, expanded=None):
+    """Visible node set for a view mode with no query selected
+
+    expanded=None treats every node as expanded.
+    """
+    duplicates = set(duplicate_nodes)
+    shared = set(shared_nodes)
+    shared_by_parent = defaultdict(list)
+    for shared_id in shared_nodes:
+        for parent_id in nodes.get(shared_id, {}).get('parents', []):
+            shared_by_parent[parent_id].append(shared_id)
+
+    def is_expanded(node_id):
+        return expanded is None or node_id in expanded
+
+    visible = set()
+    stack = []
+    for root_id in roots:
+        visible.add(root_id)
+        if is_expanded(root_id):
+            stack.extend(reversed(children[root_id]))
+
+    while stack:
+        node_id = stack.pop()
+        if node_id in visible:
+            continue
+        node = nodes.get(node_id)
+        if node is None:
+            continue
+        if node.get('level') == 'workflow' and not show_workflows:
+            continue
+        if show_rationalized:
+            if node_id in duplicates:
+                continue
+        elif node_id in shared or _is_shared_id(node_id):
+            continue
+
+        visible.add(node_id)
+        if not is_expanded(node_id):
+            continue
+
+        node_children = list(children[node_id])
+        if show_rationalized and node_id not in shared:
+            for child_id in children[node_id]:
+                if child_id in duplicates:
+                    node_children.extend(shared_by_parent[node_id])
+        stack.extend(reversed(node_children))
+
+    return visible
+
+
+def collect_by_level(nodes, children, roots, visible, show_workflows):
+    """Depth-first level buckets and layout tree, as in HierarchyVisualization"""
+    nodes_by_level = {level: [] for level in LEVELS}
+    placed = set()
+    traversed = set()
+    parent_child = defaultdict(list)
+    child_parent = {}
+
+    for root_id in sorted(roots):
+        if root_id not in visible:
+            continue
+        stack = [(root_id, None)]
+        while stack:
+            node_id, parent_id = stack.pop()
+            node = nodes.get(node_id)
+            if node is None or node.get('level') == 'workflow':
+                continue
+            level = node.get('level')
+
+            if node_id in visible and node_id not in placed and level in nodes_by_level:
+                nodes_by_level[level].append(node_id)
+                placed.add(node_id)
+                if parent_id is not None:
+                    parent_child[parent_id].append(node_id)
+                    child_parent[node_id] = parent_id
+
+            # Re-traversing an already traversed node cannot place anything new
+            if node_id in traversed:
+                continue
+            traversed.add(node_id)
+
+            next_ids = []
+            for child_id in children[node_id]:
+                child = nodes.get(child_id)
+                if child is None or child_id not in visible:
+                    continue
+                if level == 'product':
+                    if child.get('level') == 'outcome':
+                        next_ids.append(child_id)
+                elif child.get('level') != 'workflow':
+                    next_ids.append(child_id)
+            stack.extend((child_id, node_id) for child_id in reversed(next_ids))
+
+    if show_workflows:
+        nodes_by_level['workflow'] = sorted(
+            node_id for node_id in visible if nodes.get(node_id, {}).get('level') == 'workflow'
+        )
+
+    for level in ['outcome', 'scenario', 'step', 'action']:
+        level_nodes = nodes_by_level[level]
+        if len(level_nodes) <= 1:
+            continue
+        groups = defaultdict(list)
+        orphans = []
+        for node_id in level_nodes:
+            parent_id = child_parent.get(node_id)
+            if parent_id is not None:
+                groups[parent_id].append(node_id)
+            else:
+                orphans.append(node_id)
+        ordered = list(orphans)
+        for parent_id in nodes_by_level[PARENT_LEVEL[level]]:
+            ordered.extend(groups.get(parent_id, []))
+        nodes_by_level[level] = ordered
+
+    return nodes_by_level, dict(parent_child), child_parent
+
+
+def level_y_positions(config):
+    base = config['margin'] + 50
+    return {
+        'product': base,
+        'workflow': base + config['levelHeight'],
+        'outcome': base + config['levelHeight'] * 2,
+        'scenario': base + config['levelHeight'] * 3,
+        'step': base + config['levelHeight'] * 4,
+        'action': base + config['levelHeight'] * 5,
+    }
+
+
+def calculate_compact_branch_layout(nodes_by_level, nodes, parent_child, config=None):
+    """Iterative port of calculateCompactBranchLayout
+
+    Returns (positions, graph_bounds) using the same keys as NodeLayoutInfo.
+    """
+    config = config or LAYOUT_CONFIG
+    node_width = config['nodeWidth']
+    spacing = config['minNodeSpacing']
+    margin = config['margin']
+    label_margin = config['labelMargin']
+    level_y = level_y_positions(config)
+    leaf_width = node_width + 2 * spacing
+
+    max_node_count = max((len(ids) for ids in nodes_by_level.values()), default=0)
+    min_graph_width = max(
+        1000,
+        max_node_count * node_width + (max_node_count + 1) * spacing + label_margin + 2 * margin,
+    )
+
+    bounds_cache = {}
+
+    def branch_bounds(root_id, root_level):
+        """Bounds for (root_id, root_level), filling the cache bottom-up"""
+        stack = [(root_id, root_level, False)]
+        while stack:
+            node_id, level, ready = stack.pop()
+            key = (node_id, level)
+            if key in bounds_cache:
+                continue
+            kids = parent_child.get(node_id, [])
+            if not kids:
+                bounds_cache[key] = {'startX': 0, 'width': leaf_width, 'nodeCount': 1, 'maxNodesInLevel': 1}
+                continue
+            child_level = NEXT_LEVEL.get(level)
+            child_keys = [(c, child_level) for c in kids if c in nodes and child_level]
+            if not ready:
+                stack.append((node_id, level, True))
+                stack.extend((c, lvl, False) for c, lvl in child_keys if (c, lvl) not in bounds_cache)
+                continue
+
+            child_bounds = [bounds_cache[k] for k in child_keys]
+            max_at_level = len(kids)
+            for b in child_bounds:
+                max_at_level = max(max_at_level, b['maxNodesInLevel'])
+            total_child_width = 0
+            for b in child_bounds:
+                total_child_width += b['width']
+            direct_min_width = len(kids) * node_width + (len(kids) + 1) * spacing
+            node_count = 1
+            for b in child_bounds:
+                node_count += b['nodeCount']
+            bounds_cache[key] = {
+                'startX': 0,
+                'width': max(total_child_width, direct_min_width, leaf_width),
+                'nodeCount': node_count,
+                'maxNodesInLevel': max(len(kids), max_at_level),
+            }
+        return bounds_cache[(root_id, root_level)]
+
+    positions = {}
+    roots = nodes_by_level.get('product', [])
+    root_bounds = {}
+    total_root_width = 0
+    for root_id in roots:
+        root_bounds[root_id] = branch_bounds(root_id, 'product')
+        total_root_width += root_bounds[root_id]['width']
+
+    graph_width = max(min_graph_width, total_root_width + label_margin + 2 * margin)
+    available_width = graph_width - label_margin - 2 * margin
+    current_x = label_margin + margin
+    total_root_min_width = len(roots) * node_width + (len(roots) - 1) * spacing
+
+    if total_root_min_width > available_width:
+        for root_id in roots:
+            positions[root_id] = {
+                'x': current_x + node_width / 2,
+                'y': level_y['product'],
+                'branchBounds': dict(root_bounds[root_id], startX=current_x, width=node_width + spacing),
+            }
+            current_x += node_width + spacing
+    else:
+        extra_space = available_width - total_root_width
+        between = extra_space / (len(roots) + 1) if len(roots) > 1 else extra_space / 2
+        current_x += between
+        for root_id in roots:
+            bounds = root_bounds[root_id]
+            positions[root_id] = {
+                'x': current_x + bounds['width'] / 2,
+                'y': level_y['product'],
+                'branchBounds': dict(bounds, startX=current_x),
+            }
+            current_x += bounds['width'] + between
+
+    def shift_subtree(node_id, offset):
+        stack = list(parent_child.get(node_id, []))
+        while stack:
+            child_id = stack.pop()
+            pos = positions.get(child_id)
+            if pos is None:
+                continue
+            pos['x'] += offset
+            if 'branchBounds' in pos:
+                pos['branchBounds']['startX'] += offset
+            stack.extend(parent_child.get(child_id, []))
+
+    # Pre-order placement; a parent is final before its children are placed,
+    # except for centering shifts, which move the whole already-placed subtree
+    work = [(root_id, 'product') for root_id in reversed(roots) if root_id in positions]
+    pending_centering = []
+    while work:
+        item = work.pop()
+        if item[0] is None:
+            pending_centering.pop()()
+            continue
+        node_id, level = item
+        kids = parent_child.get(node_id, [])
+        next_level = NEXT_LEVEL.get(level)
+        if not kids or not next_level:
+            continue
+        bounds = positions[node_id]['branchBounds']
+        kid_bounds = [branch_bounds(c, next_level) for c in kids]
+
+        if len(kids) == 1:
+            child_id = kids[0]
+            positions[child_id] = {
+                'x': bounds['startX'] + bounds['width'] / 2,
+                'y': level_y[next_level],
+                'branchBounds': dict(kid_bounds[0], startX=bounds['startX']),
+            }
+            work.append((child_id, next_level))
+            continue
+
+        child_x = bounds['startX']
+        for child_id, b in zip(kids, kid_bounds):
+            positions[child_id] = {
+                'x': child_x + b['width'] / 2,
+                'y': level_y[next_level],
+                'branchBounds': dict(b, startX=child_x, width=b['width']),
+            }
+            child_x += b['width']
+
+        total_children_width = child_x - bounds['startX']
+        if total_children_width < bounds['width']:
+            offset = (bounds['width'] - total_children_width) / 2
+
+            def center(kids=kids, offset=offset):
+                for child_id in kids:
+                    pos = positions[child_id]
+                    pos['x'] += offset
+                    pos['branchBounds']['startX'] += offset
+                    shift_subtree(child_id, offset)
+
+            pending_centering.append(center)
+            work.append((None, None))
+        work.extend((child_id, next_level) for child_id in reversed(kids))
+
+    for level in LEVELS:
+        for node_id in nodes_by_level.get(level, []):
+            if node_id not in positions:
+                positions[node_id] = {'x': graph_width / 2, 'y': level_y[level]}
+
+    graph_bounds = {
+        'width': graph_width,
+        'height': margin * 2 + 50 + config['levelHeight'] * 5 + 50,
+    }
+    return positions, graph_bounds
+
+
+def compute_layout(nodes, duplicate_nodes, shared_nodes, show_rationalized, show_workflows,
+                   expanded=None, config=None):
+    """Layout for one view mode of an already preprocessed graph"""
+    children, roots = build_graph(nodes)
+    visible = collect_visible(nodes, children, roots, duplicate_nodes, shared_nodes,
+                              show_rationalized, show_workflows, expanded)
+    nodes_by_level, parent_child, _ = collect_by_level(nodes, children, roots, visible, show_workflows)
+    positions, graph_bounds = calculate_compact_branch_layout(nodes_by_level, nodes, parent_child, config)
+    return {
+        'positions': positions,
+        'graphBounds': graph_bounds,
+        'visible': sorted(visible),
+    }
+
+
+def compute_domain_layouts(raw_nodes, config=None):
+    """All view-mode layouts for a domain's raw parsed nodes"""
+    config = config or LAYOUT_CONFIG
+    nodes, duplicate_nodes, shared_nodes = preprocess_domain_nodes(raw_nodes)
+    return {
+        name: compute_layout(nodes, duplicate_nodes, shared_nodes, rationalized, workflows, config=config)
+        for name, rationalized, workflows in VIEW_MODES
+    }
+
+
+def layout_path(out_dir, domain_name, source_hash):
+    return os.path.join(out_dir, f'{domain_name}.{source_hash[:16]}.layout.json')
+
+
+def precompute_domain(domain_name, out_dir=DEFAULT_OUT_DIR, config=None, force=False):
+    """Write the layout file for a domain unless a current one exists
+
+    Returns (path, written).
+    """
+    config = config or LAYOUT_CONFIG
+    raw_nodes = extract_nodes_from_file(os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts'))
+    source_hash = graph_hash(raw_nodes)
+    path = layout_path(out_dir, domain_name, source_hash)
+
+    if not force and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('version') == LAYOUT_VERSION and cached.get('config') == config:
+                return path, False
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    payload = {
+        'version': LAYOUT_VERSION,
+        'domain': domain_name,
+        'graphHash': source_hash,
+        'config': config,
+        'modes': compute_domain_layouts(raw_nodes, config),
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, separators=(',', ':'))
+
+    # Drop layouts for older revisions of this domain's graph
+    for stale in glob.glob(os.path.join(out_dir, f'{domain_name}.*.layout.json')):
+        if stale != path:
+            os.remove(stale)
+    return path, True
+
+
+def write_manifest(out_dir):
+    """Map each domain to its current layout file"""
+    manifest = {}
+    for path in sorted(glob.glob(os.path.join(out_dir, '*.layout.json'))):
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        manifest[payload['domain']] = {'file': os.path.basename(path), 'graphHash': payload['graphHash']}
+    with open(os.path.join(out_dir, 'index.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute hierarchy layouts for each domain and view mode')
+    parser.add_argument('domains', nargs='*', help='Domains to lay out (default: all)')
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help=f'Output directory (default: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--force', action='store_true', help='Recompute even if a current layout file exists')
+    args = parser.parse_args()
+
+    domains = args.domains or list_domains()
+
+    print("=" * 60)
+    print("LAYOUT PRECOMPUTATION")
+    print("=" * 60)
+
+    for domain in domains:
+        if not os.path.exists(os.path.join(DOMAINS_DIR, domain, 'nodes.ts')):
+            print(f"\n⚠️  Unknown domain: {domain}")
+            continue
+        path, written = precompute_domain(domain, args.out, force=args.force)
+        status = "written" if written else "up to date"
+        print(f"  {domain.upper():15} {status}: {path}")
+
+    write_manifest(args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
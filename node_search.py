@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Level-aware node search across domains and backup files
+
+Python counterpart of searchNodes in src/utils/nodeSearch.ts. Each nodes.ts
+(and every nodes.backup*.ts next to it) gets a prefix trie over label words,
+word and trigram postings over labels, IDs and descriptions, and each
+node's root path precomputed the way findPathToRoot walks it. A query only scores the nodes
+the postings return, with the same similarity as nodeSearch.ts, so searching
+every domain and backup at once stays interactive.
+
+Unlike nodeSearch.ts, nodes that share no trigram, word prefix or word
+containment with the query are never candidates, so pure edit-distance
+matches between unrelated strings are not returned.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+from domain_config import DOMAINS_DIR, list_domains
+from query_matcher import levenshtein_distance
+from validate_domains import extract_nodes_from_file
+
+MIN_SCORE = 0.3
+MAX_RESULTS = 20
+SEARCH_FIELDS = ('label', 'id', 'description')
+
+
+def bounded_levenshtein(s1, s2, limit):
+    """Levenshtein distance, or None as soon as it must exceed limit
+
+    Only cells within limit of the diagonal are filled in.
+    """
+    m, n = len(s1), len(s2)
+    if abs(m - n) > limit:
+        return None
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(n + 1)]
+    for i in range(1, m + 1):
+        lo, hi = max(1, i - limit), min(n, i + limit)
+        current = [over] * (n + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        c1 = s1[i - 1]
+        for j in range(lo, hi + 1):
+            if c1 == s2[j - 1]:
+                value = previous[j - 1]
+            else:
+                value = min(previous[j], current[j - 1], previous[j - 1]) + 1
+            current[j] = value if value < over else over
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[n] if previous[n] <= limit else None
+
+
+def quick_similarity(s1, s2):
+    """Exact, containment and word-overlap tiers of calculateSimilarity
+
+    Returns None when only the edit-distance tier applies.
+    """
+    if s1 == s2:
+        return 1.0
+
+    if s2 in s1 or s1 in s2:
+        longer, shorter = (s1, s2) if len(s1) > len(s2) else (s2, s1)
+        return 0.7 + 0.3 * (len(shorter) / len(longer))
+
+    words1 = re.split(r'\s+', s1)
+    words2 = re.split(r'\s+', s2)
+    matched = sum(1 for w2 in words2 if any(w2 in w1 or w1 in w2 for w1 in words1))
+    if matched > 0:
+        return 0.4 + 0.3 * (matched / max(len(words1), len(words2)))
+    return None
+
+
+def edit_similarity(s1, s2, floor=0):
+    """Edit-distance tier of calculateSimilarity; 0 if it would fall below floor"""
+    max_len = max(len(s1), len(s2))
+    if floor <= 0:
+        return max(0, 1 - levenshtein_distance(s1, s2) / max_len)
+    distance = bounded_levenshtein(s1, s2, int((1 - floor) * max_len))
+    return 0 if distance is None else max(0, 1 - distance / max_len)
+
+
+def calculate_similarity(s1, s2):
+    """Similarity between two lowercase strings, as in nodeSearch.ts"""
+    score = quick_similarity(s1, s2)
+    return edit_similarity(s1, s2) if score is None else score
+
+
+def short_substrings(word):
+    """1- and 2-character substrings, for query words too short for trigrams"""
+    return {word[i:i + n] for n in (1, 2) for i in range(len(word) - n + 1)}
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def root_paths(nodes):
+    """findPathToRoot for every node: first-parent chain up to a product or workflow"""
+    paths = {}
+    for start in nodes:
+        chain = []
+        seen = set()
+        node_id = start
+        prefix = []
+        while True:
+            if node_id in paths:
+                prefix = list(paths[node_id])
+                break
+            if node_id in seen or node_id not in nodes:
+                break
+            seen.add(node_id)
+            chain.append(node_id)
+            node = nodes[node_id]
+            if node.get('level') in ('product', 'workflow') or not node.get('parents'):
+                break
+            node_id = node['parents'][0]
+        for node_id in reversed(chain):
+            prefix.append(node_id)
+            paths[node_id] = tuple(prefix)
+    return paths
+
+
+class SourceIndex:
+    """Search index over one parsed nodes file"""
+
+    def __init__(self, source, domain, nodes):
+        self.source = source
+        self.domain = domain
+        self.nodes = nodes
+        self.ids = list(nodes)
+        self.fields = [
+            {field: (nodes[node_id].get(field) or '').lower() for field in SEARCH_FIELDS}
+            for node_id in self.ids
+        ]
+        self.paths = root_paths(nodes)
+        self.trie = {}
+        self.words = defaultdict(set)
+        self.short = defaultdict(set)
+        self.grams = defaultdict(set)
+
+        for i, fields in enumerate(self.fields):
+            for word in set(' '.join(fields.values()).split()):
+                self.words[word].add(i)
+                for part in short_substrings(word):
+                    self.short[part].add(i)
+            for word in fields['label'].split():
+                node = self.trie
+                for char in word:
+                    node = node.setdefault(char, {})
+                node.setdefault('', set()).add(i)
+            for value in fields.values():
+                for gram in trigrams(value):
+                    self.grams[gram].add(i)
+
+    def prefix_matches(self, prefix):
+        """Nodes with a label word starting with prefix"""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        found = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if key == '':
+                    found |= value
+                else:
+                    stack.append(value)
+        return found
+
+    def candidates(self, query):
+        """Nodes sharing a trigram, a word prefix or a word containment with the query"""
+        found = set()
+        for word in query.split():
+            found |= self.prefix_matches(word)
+            if len(word) < 3:
+                found |= self.short.get(word, set())
+            # Label words contained in a query word
+            for start in range(len(word)):
+                for end in range(start + 1, len(word) + 1):
+                    found |= self.words.get(word[start:end], set())
+        for gram in trigrams(query):
+            found |= self.grams.get(gram, set())
+        return found
+
+    def filtered_candidates(self, query, levels=None, products=None):
+        for i in self.candidates(query):
+            node = self.nodes[self.ids[i]]
+            if levels and node.get('level') not in levels:
+                continue
+            if products and not set(node.get('products') or []) & products:
+                continue
+            yield i
+
+    def result(self, i, query, field_scores, min_score=MIN_SCORE):
+        """Result dict for node i given its per-field scores, or None below min_score"""
+        best_score = 0
+        match_type = 'fuzzy'
+        matched_fields = []
+        for field, score in field_scores.items():
+            value = self.fields[i][field]
+            if score > best_score:
+                best_score = score
+                if value == query:
+                    match_type = 'exact'
+                elif query in value or value in query:
+                    match_type = 'partial'
+                else:
+                    match_type = 'fuzzy'
+            if score >= min_score:
+                matched_fields.append(field)
+
+        if best_score < min_score or not matched_fields:
+            return None
+        node_id = self.ids[i]
+        node = self.nodes[node_id]
+        return {
+            'source': self.source,
+            'domain': self.domain,
+            'nodeId': node_id,
+            'label': node.get('label'),
+            'level': node.get('level'),
+            'products': node.get('products') or [],
+            'score': best_score,
+            'matchType': match_type,
+            'matchedFields': matched_fields,
+            'pathToRoot': list(self.paths.get(node_id, (node_id,))),
+        }
+
+
+def list_sources(domains=None, backups=True):
+    """(source name, domain, path) for each nodes.ts and, optionally, its backups"""
+    sources = []
+    for domain in domains or list_domains():
+        domain_dir = os.path.join(DOMAINS_DIR, domain)
+        path = os.path.join(domain_dir, 'nodes.ts')
+        if os.path.exists(path):
+            sources.append((domain, domain, path))
+        if backups:
+            for backup in sorted(glob.glob(os.path.join(domain_dir, 'nodes.backup*.ts'))):
+                sources.append((f'{domain}/{os.path.basename(backup)}', domain, backup))
+    return sources
+
+
+class NodeSearch:
+    """Search across many source indexes at once"""
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    @classmethod
+    def build(cls, domains=None, backups=True):
+        return cls([
+            SourceIndex(source, domain, extract_nodes_from_file(path))
+            for source, domain, path in list_sources(domains, backups)
+        ])
+
+    def search(self, query, levels=None, products=None, sources=None,
+               min_score=MIN_SCORE, max_results=MAX_RESULTS):
+        """Ranked matches: exact matches first, then by score
+
+        Cheap similarity tiers are scored first. The edit-distance tier then
+        only has to beat the current max_results-th score, which bounds the
+        distance computation. Scores are memoized per field value, since
+        backups repeat most labels.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        levels = set(levels) if levels else None
+        products = set(products) if products else None
+
+        scores = {}
+        results = []
+        deferred = []
+        for index in self.indexes:
+            if sources and index.source not in sources and index.domain not in sources:
+                continue
+            for i in index.filtered_candidates(query, levels, products):
+                field_scores = {}
+                for field in SEARCH_FIELDS:
+                    value = index.fields[i][field]
+                    if not value:
+                        continue
+                    if value not in scores:
+                        scores[value] = quick_similarity(value, query)
+                    field_scores[field] = scores[value]
+                if None in field_scores.values():
+                    deferred.append((index, i, field_scores))
+                elif result := index.result(i, query, field_scores, min_score):
+                    results.append(result)
+
+        floor = min_score
+        if max_results and len(results) >= max_results:
+            floor = max(floor, sorted((r['score'] for r in results), reverse=True)[max_results - 1])
+        fuzzy = {}
+        for index, i, field_scores in deferred:
+            for field, score in field_scores.items():
+                if score is None:
+                    value = index.fields[i][field]
+                    if value not in fuzzy:
+                        fuzzy[value] = edit_similarity(value, query, floor)
+                    field_scores[field] = fuzzy[value]
+            if result := index.result(i, query, field_scores, min_score):
+                results.append(result)
+
+        results.sort(key=lambda r: (r['matchType'] != 'exact', -r['score']))
+        return results[:max_results] if max_results else results
+
+
+def search_nodes(query, domains=None, backups=True, **options):
+    """One-off search; build a NodeSearch once to run many queries"""
+    return NodeSearch.build(domains, backups).search(query, **options)
+
+
+def print_results(results):
+    if not results:
+        print("  No matches")
+        return
+    for r in results:
+        print(f"  {r['score']:.2f} {r['matchType']:7} {r['source']:25} {r['nodeId']} ({r['level']}): {r['label']}")
+        print(f"       path: {' > '.join(r['pathToRoot'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search nodes across domains and backup files')
+    parser.add_argument('query', nargs='*', help='Search text (omit to read one query per line from stdin)')
+    parser.add_argument('-d', '--domains', nargs='+', metavar='DOMAIN', help='Domains to search (default: all)')
+    parser.add_argument('--level', nargs='+', help='Only return nodes at these levels')
+    parser.add_argument('--product', nargs='+', help='Only return nodes belonging to these products')
+    parser.add_argument('--no-backups', action='store_true', help='Skip nodes.backup*.ts files')
+    parser.add_argument('--min-score', type=float, default=MIN_SCORE, help=f'Minimum score (default: {MIN_SCORE})')
+    parser.add_argument('--max', type=int, default=MAX_RESULTS, help=f'Maximum results (default: {MAX_RESULTS})')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    search = NodeSearch.build(args.domains, backups=not args.no_backups)
+    options = {
+        'levels': args.level,
+        'products': args.product,
+        'min_score': args.min_score,
+        'max_results': args.max,
+    }
+
+    queries = [' '.join(args.query)] if args.query else (line for line in sys.stdin)
+    for query in queries:
+        if not query.strip():
+            continue
+        results = search.search(query, **options)
+        if args.json:
+            print(json.dumps({'query': query.strip(), 'results': results}))
+        else:
+            print(f"\n🔍 {query.strip()} ({len(results)} matches)")
+            print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Path-count ambiguity metrics for domain node graphs
+
+One pass over the graph in topological order counts, for every node, the
+product/workflow -> ... -> node paths reaching it and the node -> leaf paths
+below it, plus the products seen along those paths (as bitmasks). Nothing
+is enumerated, so workflows and shared nodes that multiply the path count
+cost no more than any other edge.
+
+A node's ambiguity is log2(root paths x leaf paths): the bits needed to pick
+one full resolution path through it.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from collections import deque
+
+from domain_config import DOMAINS_DIR, list_domains
+from reachability_index import strongly_connected_components
+from validate_domains import extract_nodes_from_file
+
+DEFAULT_TOP = 10
+
+
+def node_product_codes(node_id, node):
+    """Product codes a node carries; product nodes are 'product-<code>'"""
+    if node.get('level') == 'product' and node_id.startswith('product-'):
+        return [node_id[len('product-'):]]
+    return node.get('products') or []
+
+
+def condensed_order(nodes):
+    """Topological order of the strongly connected components of the children graph
+
+    Returns (ids, component of each node index, component order, component
+    successors, cyclic node IDs). Edges inside a component are dropped, so a
+    cycle is counted as a single node.
+    """
+    ids = list(nodes)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    successors = [
+        [index[c] for c in nodes[node_id].get('children', []) if c in index]
+        for node_id in ids
+    ]
+    component, count = strongly_connected_components(len(ids), successors)
+
+    comp_successors = [set() for _ in range(count)]
+    sizes = [0] * count
+    cyclic = []
+    for v, succ in enumerate(successors):
+        sizes[component[v]] += 1
+        for w in succ:
+            if component[w] != component[v]:
+                comp_successors[component[v]].add(component[w])
+            elif w == v:
+                cyclic.append(ids[v])
+    cyclic.extend(ids[v] for v in range(len(ids)) if sizes[component[v]] > 1)
+    # A self-loop inside a larger cycle would otherwise list its node twice
+    cyclic = list(dict.fromkeys(cyclic))
+
+    indegree = [0] * count
+    for succ in comp_successors:
+        for c in succ:
+            indegree[c] += 1
+    queue = deque(c for c in range(count) if indegree[c] == 0)
+    order = []
+    while queue:
+        c = queue.popleft()
+        order.append(c)
+        for d in sorted(comp_successors[c]):
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                queue.append(d)
+    return ids, component, order, comp_successors, cyclic
+
+
+def compute_path_counts(nodes):
+    """Per-node root/leaf path counts, product sets and ambiguity
+
+    Returns (metrics, cyclic) where metrics maps node ID to a dict and
+    cyclic lists nodes on cycles; each cycle is counted as one node.
+    """
+    ids, component, order, successors, cyclic = condensed_order(nodes)
+
+    codes = []
+    bit = {}
+    own = [0] * len(successors)
+    for v, node_id in enumerate(ids):
+        for code in node_product_codes(node_id, nodes[node_id]):
+            if code not in bit:
+                bit[code] = 1 << len(codes)
+                codes.append(code)
+            own[component[v]] |= bit[code]
+
+    # Forward pass: paths from any root, products on the way down
+    root_paths = [0] * len(order)
+    up = list(own)
+    for c in order:
+        if root_paths[c] == 0:
+            root_paths[c] = 1
+        for d in successors[c]:
+            root_paths[d] += root_paths[c]
+            up[d] |= up[c]
+    roots = set(range(len(order)))
+    for succ in successors:
+        roots -= succ
+
+    # Backward pass: paths to any leaf, products below
+    leaf_paths = [0] * len(order)
+    down = list(own)
+    for c in reversed(order):
+        leaf_paths[c] = sum(leaf_paths[d] for d in successors[c]) if successors[c] else 1
+        for d in successors[c]:
+            down[c] |= down[d]
+
+    def decode(mask):
+        return [code for code in codes if mask & bit[code]]
+
+    metrics = {}
+    for v, node_id in enumerate(ids):
+        c = component[v]
+        through = root_paths[c] * leaf_paths[c]
+        metrics[node_id] = {
+            'level': nodes[node_id].get('level'),
+            'root': c in roots,
+            'root_paths': root_paths[c],
+            'leaf_paths': leaf_paths[c],
+            'paths_through': through,
+            'products_above': decode(up[c]),
+            'products_below': decode(down[c]),
+            'products': decode(up[c] | down[c]),
+            'ambiguity': math.log2(through),
+        }
+    return metrics, cyclic
+
+
+def top_offenders(metrics, top=DEFAULT_TOP):
+    """Non-root nodes ranked by ambiguity, then by how many products they span
+
+    Roots (products and workflows) are where a resolution starts, so only
+    the nodes below them are candidates.
+    """
+    ranked = sorted(
+        ((node_id, m) for node_id, m in metrics.items() if not m['root']),
+        key=lambda item: (-item[1]['ambiguity'], -len(item[1]['products']), item[0]),
+    )
+    return ranked[:top]
+
+
+def report_path_counts(nodes, domain_name, top=DEFAULT_TOP):
+    """Print path totals and the most ambiguous nodes; returns the metrics"""
+    metrics, cyclic = compute_path_counts(nodes)
+    roots = [m for m in metrics.values() if m['root']]
+    total = sum(m['leaf_paths'] for m in roots)
+
+    print(f"{domain_name.upper()}: {len(metrics)} nodes, {len(roots)} roots, {total} root-to-leaf paths")
+    if cyclic:
+        print(f"  ⚠️  {len(cyclic)} nodes on cycles, each cycle counted once: {cyclic[:5]}")
+    print(f"  Top {top} by ambiguity (bits = log2 of paths through the node):")
+    for node_id, m in top_offenders(metrics, top):
+        print(f"    {m['ambiguity']:6.2f}  {node_id} ({m['level']}): "
+              f"{m['root_paths']} in x {m['leaf_paths']} out, products {', '.join(m['products']) or '-'}")
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-node path counts and ambiguity scores')
+    parser.add_argument('domains', nargs='*', help='Domains to analyze (default: all)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Offenders to list (default: {DEFAULT_TOP})')
+    parser.add_argument('--json', help='Write per-node metrics for all domains to this file')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PATH-COUNT AMBIGUITY")
+    print("=" * 60)
+
+    results = {}
+    for domain in args.domains or list_domains():
+        path = os.path.join(DOMAINS_DIR, domain, 'nodes.ts')
+        if not os.path.exists(path):
+            print(f"\n⚠️  Unknown domain: {domain}")
+            continue
+        print()
+        results[domain] = report_path_counts(extract_nodes_from_file(path), domain, args.top)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWritten: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
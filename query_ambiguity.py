@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Rank queries by how ambiguous they are across product variants
+
+Every query (from a domain's queries.ts or a bulk text file with one
+utterance per line) is scored against all nodes with the query_matcher port.
+For each query we report the margin between the best and runner-up scores
+and how many products have a variant of the best match within epsilon of
+the best score, then label it clear, ambiguous or workflow. A query is
+ambiguous when product variants fall within epsilon or when any match
+within epsilon of the best belongs to a different product. Queries from
+queries.ts are also checked against their hand-set isDuplicate/isWorkflow
+flags.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import Counter
+
+from domain_config import DOMAINS_DIR, list_domains, load_domain_tables, load_queries
+from query_matcher import QueryMatcher
+from validate_domains import extract_nodes_from_file
+
+DEFAULT_EPSILON = 0.1
+DEFAULT_TOP_K = 5
+
+FIELDS = [
+    'domain', 'id', 'text', 'label', 'expected', 'disagrees', 'best_node', 'best_score',
+    'margin', 'variants', 'variant_products', 'entry_node', 'entry_rank', 'top_matches',
+]
+
+
+def load_matcher(domain_name):
+    nodes = extract_nodes_from_file(os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts'))
+    tables = load_domain_tables(domain_name)
+    return QueryMatcher(nodes, tables['synonyms'], tables['word_forms'], tables['product_codes'])
+
+
+def expected_label(query):
+    """Label implied by a query's hand-set flags"""
+    if query.get('isWorkflow'):
+        return 'workflow'
+    if query.get('isDuplicate') or query.get('ambiguous'):
+        return 'ambiguous'
+    return 'clear'
+
+
+def classify(matcher, text, epsilon=DEFAULT_EPSILON, top_k=DEFAULT_TOP_K):
+    """Score text against every node and label it clear/ambiguous/workflow"""
+    matches = matcher.find_best_matches(text, top_n=None)
+    if not matches:
+        return {'label': 'unmatched', 'matches': [], 'margin': None, 'variants': 0, 'variant_products': []}
+
+    best_id, best_score, _ = matches[0]
+    runner_up = matches[1][1] if len(matches) > 1 else 0
+    best_label = matcher.nodes[best_id].get('label', '').lower()
+    best_base = matcher.base_function(best_id)
+
+    variant_products = set()
+    variants = 0
+    for node_id, score, _ in matches:
+        if best_score - score > epsilon:
+            break
+        same_function = (
+            matcher.base_function(node_id) == best_base
+            or matcher.nodes[node_id].get('label', '').lower() == best_label
+        )
+        if not same_function:
+            continue
+        variants += 1
+        if '-shared' in node_id or '-unified' in node_id:
+            variant_products.add('shared')
+        variant_products.update(matcher.node_products(node_id))
+
+    # Any match within epsilon from another product is a tie the score cannot break
+    margin = best_score - runner_up
+    best_products = matcher.node_products(best_id)
+    contested = False
+    for node_id, score, _ in matches[1:]:
+        if best_score - score > epsilon:
+            break
+        products = matcher.node_products(node_id)
+        if products and products != best_products:
+            contested = True
+            break
+
+    if matcher.nodes[best_id].get('level') == 'workflow':
+        label = 'workflow'
+    elif len(variant_products) > 1 or 'shared' in variant_products or contested:
+        label = 'ambiguous'
+    else:
+        label = 'clear'
+
+    return {
+        'label': label,
+        'matches': matches[:top_k],
+        'ranked': matches,
+        'margin': margin,
+        'variants': variants,
+        'variant_products': sorted(variant_products),
+    }
+
+
+def analyze(domain_name, queries, epsilon=DEFAULT_EPSILON, top_k=DEFAULT_TOP_K, matcher=None):
+    """Yield one result row per query dict ({'id', 'text', ...flags})"""
+    matcher = matcher or load_matcher(domain_name)
+    for query in queries:
+        result = classify(matcher, query['text'], epsilon, top_k)
+        has_flags = 'isDuplicate' in query or 'isWorkflow' in query
+        expected = expected_label(query) if has_flags else None
+        entry_node = query.get('entryNode')
+        entry_rank = None
+        if entry_node:
+            for rank, (node_id, _, _) in enumerate(result.get('ranked', []), 1):
+                if node_id == entry_node:
+                    entry_rank = rank
+                    break
+
+        best = result['matches'][0] if result['matches'] else (None, None, None)
+        yield {
+            'domain': domain_name,
+            'id': query.get('id'),
+            'text': query['text'],
+            'label': result['label'],
+            'expected': expected,
+            'disagrees': expected is not None and expected != result['label'],
+            'best_node': best[0],
+            'best_score': round(best[1], 4) if best[1] is not None else None,
+            'margin': round(result['margin'], 4) if result['margin'] is not None else None,
+            'variants': result['variants'],
+            'variant_products': result['variant_products'],
+            'entry_node': entry_node,
+            'entry_rank': entry_rank,
+            'top_matches': [[node_id, round(score, 4)] for node_id, score, _ in result['matches']],
+        }
+
+
+def read_text_file(path):
+    """Bulk utterances, one per line; blank lines and # comments are skipped"""
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            text = line.strip()
+            if text and not text.startswith('#'):
+                yield {'id': f'line-{number}', 'text': text}
+
+
+def write_rows(rows, out, fmt):
+    if fmt == 'ndjson':
+        for row in rows:
+            out.write(json.dumps(row) + '\n')
+            yield row
+        return
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        flat = dict(row)
+        flat['variant_products'] = ';'.join(row['variant_products'])
+        flat['top_matches'] = ';'.join(f'{node_id}:{score}' for node_id, score in row['top_matches'])
+        writer.writerow(flat)
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Classify queries as clear, ambiguous or workflow')
+    parser.add_argument('domains', nargs='*', help='Domains to analyze (default: all)')
+    parser.add_argument('--text', help='Bulk text file with one utterance per line (instead of queries.ts)')
+    parser.add_argument('--epsilon', type=float, default=DEFAULT_EPSILON,
+                        help=f'Score window for counting product variants (default: {DEFAULT_EPSILON})')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help=f'Matches to report per query (default: {DEFAULT_TOP_K})')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv', help='Output format (default: csv)')
+    parser.add_argument('--out', help='Output file (default: stdout)')
+    args = parser.parse_args()
+
+    domains = args.domains or list_domains()
+    out = open(args.out, 'w', newline='') if args.out else sys.stdout
+
+    def all_rows():
+        for domain in domains:
+            if not os.path.exists(os.path.join(DOMAINS_DIR, domain, 'nodes.ts')):
+                print(f"⚠️  Unknown domain: {domain}", file=sys.stderr)
+                continue
+            queries = read_text_file(args.text) if args.text else load_queries(domain)
+            yield from analyze(domain, queries, args.epsilon, args.top_k)
+
+    labels = Counter()
+    disagreements = []
+    try:
+        for row in write_rows(all_rows(), out, args.format):
+            labels[row['label']] += 1
+            if row['disagrees']:
+                disagreements.append(row)
+    finally:
+        if args.out:
+            out.close()
+
+    summary = ', '.join(f'{count} {label}' for label, count in sorted(labels.items()))
+    print(f"{sum(labels.values())} queries: {summary}", file=sys.stderr)
+    if disagreements:
+        print(f"⚠️  {len(disagreements)} disagree with hand-set flags:", file=sys.stderr)
+        for row in disagreements[:10]:
+            print(f"  - {row['domain']}/{row['id']}: flagged {row['expected']}, scored {row['label']}"
+                  f" (margin {row['margin']}, {row['variants']} variants)", file=sys.stderr)
+        if len(disagreements) > 10:
+            print(f"  ... and {len(disagreements) - 10} more", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
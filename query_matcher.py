@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Python port of findBestMatches in src/utils/queryMatcher.ts
+
+Scores match the TypeScript matcher. Node labels are tokenized once per
+matcher, and word-pair similarities are cached, so scoring many queries
+against one domain only pays for each distinct input token once.
+"""
+
+import re
+
+from synonym_tables import groups_by_token
+
+STOP_WORDS = frozenset([
+    'i', 'want', 'to', 'need', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at',
+    'for', 'with', 'from', 'by', 'about', 'my', 'our', 'we',
+])
+SUFFIXES = ['ing', 'ed', 'er', 'est', 'ly', 'ness', 'ment', 's', 'es']
+MIN_SCORE = 0.2
+
+
+def tokenize(text):
+    """Lowercase, strip punctuation and drop stop words"""
+    words = re.sub(r'[^\w\s]', ' ', text.lower(), flags=re.ASCII).split()
+    return [word for word in words if word not in STOP_WORDS]
+
+
+def stem_word(word, word_forms=None):
+    """Word-form lookup, else strip the first matching common suffix"""
+    lower = word.lower()
+    if word_forms and lower in word_forms:
+        return word_forms[lower]
+    for suffix in SUFFIXES:
+        if lower.endswith(suffix) and len(lower) > len(suffix) + 2:
+            return lower[:-len(suffix)]
+    return lower
+
+
+def levenshtein_distance(s1, s2):
+    m, n = len(s1), len(s2)
+    if m == 0:
+        return n
+    if n == 0:
+        return m
+    previous = list(range(n + 1))
+    for i in range(1, m + 1):
+        current = [i] + [0] * n
+        for j in range(1, n + 1):
+            if s1[i - 1] == s2[j - 1]:
+                current[j] = previous[j - 1]
+            else:
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + 1)
+        previous = current
+    return previous[n]
+
+
+class QueryMatcher:
+    """Scores free text against every node of one domain"""
+
+    def __init__(self, nodes, synonyms=None, word_forms=None, product_codes=None):
+        self.nodes = nodes
+        self.synonyms = synonyms or {}
+        self.word_forms = word_forms or {}
+        self.product_codes = list(product_codes or [])
+        self._stems = {}
+        self._pairs = {}
+        self._token_groups = groups_by_token(self.synonyms)
+
+        # Per-node token vectors, built once
+        self.node_tokens = {}
+        self.node_phrases = {}
+        for node_id, node in nodes.items():
+            tokens = tokenize(node.get('label', ''))
+            self.node_tokens[node_id] = tokens
+            self.node_phrases[node_id] = ' '.join(tokens)
+
+    def stem(self, word):
+        lower = word.lower()
+        if lower not in self._stems:
+            self._stems[lower] = stem_word(lower, self.word_forms)
+        return self._stems[lower]
+
+    def are_synonyms(self, word1, word2):
+        w1, w2 = word1.lower(), word2.lower()
+        no_groups = frozenset()
+        return not self._token_groups.get(w1, no_groups).isdisjoint(self._token_groups.get(w2, no_groups))
+
+    def word_similarity(self, word1, word2):
+        """(score, match type) for a word pair, cached"""
+        key = (word1, word2)
+        if key in self._pairs:
+            return self._pairs[key]
+
+        w1, w2 = word1.lower(), word2.lower()
+        if w1 == w2:
+            result = (1.0, 'exact')
+        elif self.stem(w1) == self.stem(w2):
+            result = (0.8, 'stem')
+        elif self.are_synonyms(w1, w2):
+            result = (0.7, 'synonym')
+        else:
+            result = (0, None)
+            max_len = max(len(w1), len(w2))
+            if max_len > 4 and abs(len(w1) - len(w2)) <= 2:
+                distance = levenshtein_distance(w1, w2)
+                if distance <= 2:
+                    result = (0.5 * (1 - distance / max_len), 'fuzzy')
+
+        self._pairs[key] = result
+        return result
+
+    def score_node(self, input_tokens, node_id):
+        """Score one node the way findBestMatches does; returns (score, matched words)"""
+        node_tokens = self.node_tokens[node_id]
+        total = 0
+        matched = []
+        used = set()
+        exact = synonym = 0
+
+        for input_token in input_tokens:
+            best_score = 0
+            best_token = ''
+            best_type = None
+            for node_token in node_tokens:
+                if node_token in used:
+                    continue
+                score, match_type = self.word_similarity(input_token, node_token)
+                if score > best_score:
+                    best_score, best_token, best_type = score, node_token, match_type
+            if best_score > 0:
+                total += best_score
+                matched.append(best_token)
+                if best_token:
+                    used.add(best_token)
+                if best_type == 'exact':
+                    exact += 1
+                elif best_type == 'synonym':
+                    synonym += 1
+
+        count = len(input_tokens)
+        normalized = total / count
+        exact_bonus = (exact / count) * 0.15
+        synonym_penalty = (synonym / count) * -0.05
+        match_ratio = len(matched) / count
+        compound_bonus = (match_ratio - 0.5) * 0.1 if match_ratio > 0.5 else 0
+
+        input_phrase = ' '.join(input_tokens)
+        node_phrase = self.node_phrases[node_id]
+        if node_phrase == input_phrase:
+            order_bonus = 0.2
+        elif input_phrase in node_phrase:
+            order_bonus = 0.1
+        else:
+            order_bonus = 0
+
+        level = self.nodes[node_id].get('level')
+        level_boost = 0.1 if level == 'action' else 0.05 if level == 'step' else 0
+
+        final = min(1.0, normalized + exact_bonus + synonym_penalty + compound_bonus + order_bonus + level_boost)
+        return final, matched
+
+    def find_best_matches(self, text, top_n=5):
+        """Ranked [(node_id, score, matched words)] above the minimum score"""
+        input_tokens = tokenize(text)
+        if not input_tokens:
+            return []
+        results = []
+        for node_id in self.nodes:
+            score, matched = self.score_node(input_tokens, node_id)
+            if score > MIN_SCORE:
+                results.append((node_id, score, matched))
+        results.sort(key=lambda r: -r[1])
+        return results[:top_n] if top_n else results
+
+    def base_function(self, node_id):
+        """Node ID with its product suffix removed, as in generateQueryFromText"""
+        base = node_id
+        for code in self.product_codes:
+            if node_id.endswith(f'-{code}'):
+                base = node_id[:-len(code) - 1]
+        return base
+
+    def node_products(self, node_id):
+        """Products a node belongs to: its products list, else its ID suffix"""
+        products = self.nodes.get(node_id, {}).get('products') or []
+        if products:
+            return set(products)
+        return {code for code in self.product_codes if f'-{code}' in node_id}
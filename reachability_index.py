@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Reachability index for ancestor/descendant queries over domain node graphs
+
+Nodes are numbered by a DFS post-order over the (cycle-condensed) graph, so
+every node's descendant set is a short list of disjoint post-order intervals.
+A query is a binary search in that list instead of a fresh graph walk.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from bisect import bisect_right
+
+from domain_config import DOMAINS_DIR, list_domains
+
+INDEX_VERSION = 1
+
+
+def graph_hash(nodes):
+    """Stable content hash of a parsed node graph"""
+    payload = json.dumps(nodes, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def strongly_connected_components(count, successors):
+    """Iterative Tarjan SCC; returns (component number of each vertex, component count)"""
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    component = [-1] * count
+    stack = []
+    counter = 0
+    comp_count = 0
+
+    for start in range(count):
+        if index[start] != -1:
+            continue
+        work = [(start, 0)]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+
+        while work:
+            v, i = work[-1]
+            succ = successors[v]
+            if i < len(succ):
+                work[-1] = (v, i + 1)
+                w = succ[i]
+                if index[w] == -1:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    lowlink[v] = min(lowlink[v], index[w])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[v])
+            if lowlink[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = comp_count
+                    if w == v:
+                        break
+                comp_count += 1
+
+    return component, comp_count
+
+
+class _IntervalLabels:
+    """Post-order interval labels for one direction of a DAG"""
+
+    def __init__(self, post=None, starts=None, ends=None):
+        self.post = post or []
+        self.starts = starts or []
+        self.ends = ends or []
+
+    @classmethod
+    def build(cls, count, successors):
+        has_pred = [False] * count
+        for succ in successors:
+            for w in succ:
+                has_pred[w] = True
+
+        post = [-1] * count
+        low = [0] * count
+        visited = [False] * count
+        order = []
+        counter = 0
+        roots = [v for v in range(count) if not has_pred[v]]
+
+        # Spanning forest DFS; roots first, then anything left unvisited
+        for start in roots + list(range(count)):
+            if visited[start]:
+                continue
+            visited[start] = True
+            work = [(start, 0, counter)]
+            while work:
+                v, i, entry = work[-1]
+                succ = successors[v]
+                if i < len(succ):
+                    work[-1] = (v, i + 1, entry)
+                    w = succ[i]
+                    if not visited[w]:
+                        visited[w] = True
+                        work.append((w, 0, counter))
+                    continue
+                work.pop()
+                low[v] = entry
+                post[v] = counter
+                order.append(v)
+                counter += 1
+
+        # Post-order is a reverse topological order of a DAG, so every
+        # successor's intervals are final before its predecessors are merged
+        starts = [None] * count
+        ends = [None] * count
+        for v in order:
+            spans = [(low[v], post[v])]
+            for w in successors[v]:
+                spans.extend(zip(starts[w], ends[w]))
+            spans.sort()
+            merged_starts = []
+            merged_ends = []
+            for s, e in spans:
+                if merged_ends and s <= merged_ends[-1] + 1:
+                    if e > merged_ends[-1]:
+                        merged_ends[-1] = e
+                else:
+                    merged_starts.append(s)
+                    merged_ends.append(e)
+            starts[v] = merged_starts
+            ends[v] = merged_ends
+
+        return cls(post, starts, ends)
+
+    def reaches(self, source, target):
+        """True if target is in source's closure (inclusive)"""
+        pos = self.post[target]
+        starts = self.starts[source]
+        i = bisect_right(starts, pos) - 1
+        return i >= 0 and pos <= self.ends[source][i]
+
+    def closure(self, source, by_post):
+        """Yield every vertex in source's closure (inclusive)"""
+        for s, e in zip(self.starts[source], self.ends[source]):
+            for pos in range(s, e + 1):
+                yield by_post[pos]
+
+    def to_dict(self):
+        return {
+            'post': self.post,
+            'intervals': [
+                [x for span in zip(s, e) for x in span]
+                for s, e in zip(self.starts, self.ends)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        starts = [flat[0::2] for flat in data['intervals']]
+        ends = [flat[1::2] for flat in data['intervals']]
+        return cls(list(data['post']), starts, ends)
+
+
+class ReachabilityIndex:
+    """Answers ancestor/descendant queries over a parsed node graph
+
+    Edges follow each node's `children` array, matching the reachability
+    walks in validate_domains.py. References to unknown nodes are ignored.
+    Nodes on a cycle share one component and therefore reach each other.
+    """
+
+    def __init__(self, ids, component, forward, backward, products, source_hash=None):
+        self.ids = ids
+        self.position = {node_id: i for i, node_id in enumerate(ids)}
+        self.component = component
+        self.forward = forward
+        self.backward = backward
+        self.products = products
+        self.graph_hash = source_hash
+        self._by_post = {}
+
+    @classmethod
+    def build(cls, nodes):
+        ids = list(nodes)
+        position = {node_id: i for i, node_id in enumerate(ids)}
+        successors = [
+            [position[c] for c in nodes[node_id].get('children', []) if c in position]
+            for node_id in ids
+        ]
+
+        component, comp_count = strongly_connected_components(len(ids), successors)
+        comp_succ = [set() for _ in range(comp_count)]
+        comp_pred = [set() for _ in range(comp_count)]
+        for v, succ in enumerate(successors):
+            cv = component[v]
+            for w in succ:
+                cw = component[w]
+                if cv != cw:
+                    comp_succ[cv].add(cw)
+                    comp_pred[cw].add(cv)
+
+        forward = _IntervalLabels.build(comp_count, [sorted(s) for s in comp_succ])
+        backward = _IntervalLabels.build(comp_count, [sorted(p) for p in comp_pred])
+        products = [node_id for node_id in ids if nodes[node_id].get('level') == 'product']
+        return cls(ids, component, forward, backward, products, graph_hash(nodes))
+
+    def _comp(self, node_id):
+        return self.component[self.position[node_id]]
+
+    def _members_by_post(self, labels):
+        if id(labels) not in self._by_post:
+            members = [[] for _ in labels.post]
+            for v, c in enumerate(self.component):
+                members[labels.post[c]].append(self.ids[v])
+            self._by_post[id(labels)] = members
+        return self._by_post[id(labels)]
+
+    def __contains__(self, node_id):
+        return node_id in self.position
+
+    def reaches(self, source_id, target_id):
+        """True if target is source or reachable from it through children"""
+        if source_id not in self.position or target_id not in self.position:
+            return False
+        return self.forward.reaches(self._comp(source_id), self._comp(target_id))
+
+    def is_ancestor(self, ancestor_id, node_id):
+        """True if ancestor_id is a strict ancestor of node_id"""
+        return ancestor_id != node_id and self.reaches(ancestor_id, node_id)
+
+    def is_descendant(self, node_id, ancestor_id):
+        """True if node_id is a strict descendant of ancestor_id"""
+        return self.is_ancestor(ancestor_id, node_id)
+
+    def is_node_or_ancestor_in(self, node_id, node_set):
+        """True if node_id or any of its ancestors is in node_set"""
+        return any(self.reaches(candidate, node_id) for candidate in node_set)
+
+    def descendants(self, node_id):
+        """All strict descendants of node_id"""
+        return self._closure(node_id, self.forward)
+
+    def ancestors(self, node_id):
+        """All strict ancestors of node_id"""
+        return self._closure(node_id, self.backward)
+
+    def _closure(self, node_id, labels):
+        if node_id not in self.position:
+            return set()
+        members = self._members_by_post(labels)
+        result = set()
+        for group in labels.closure(self._comp(node_id), members):
+            result.update(group)
+        result.discard(node_id)
+        return result
+
+    def products_reaching(self, node_id):
+        """Product node IDs whose tree contains node_id"""
+        return [p for p in self.products if self.reaches(p, node_id)]
+
+    def to_dict(self):
+        return {
+            'version': INDEX_VERSION,
+            'graph_hash': self.graph_hash,
+            'ids': self.ids,
+            'component': self.component,
+            'products': self.products,
+            'forward': self.forward.to_dict(),
+            'backward': self.backward.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported reachability index version: {data.get('version')}")
+        return cls(
+            list(data['ids']),
+            list(data['component']),
+            _IntervalLabels.from_dict(data['forward']),
+            _IntervalLabels.from_dict(data['backward']),
+            list(data['products']),
+            data.get('graph_hash'),
+        )
+
+
+def save_index(path, nodes, index):
+    """Write the parsed graph and its index to one JSON file"""
+    with open(path, 'w') as f:
+        json.dump({'nodes': nodes, 'index': index.to_dict()}, f, separators=(',', ':'))
+
+
+def load_index(path):
+    """Load (nodes, index) from a file written by save_index
+
+    Raises ValueError if the stored index does not match the stored graph.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    nodes = data['nodes']
+    index = ReachabilityIndex.from_dict(data['index'])
+    if index.graph_hash != graph_hash(nodes):
+        raise ValueError(f"Reachability index in {path} is stale for its graph")
+    return nodes, index
+
+
+def load_or_build_index(domain_name, cache_dir=None):
+    """Parse a domain and return (nodes, index), reusing a cached index if fresh"""
+    # validate_domains imports this module for its product independence check
+    from validate_domains import extract_nodes_from_file
+
+    nodes = extract_nodes_from_file(os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts'))
+    current_hash = graph_hash(nodes)
+    cache_path = os.path.join(cache_dir, f'{domain_name}.reach.json') if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            cached_nodes, index = load_index(cache_path)
+            if index.graph_hash == current_hash:
+                return cached_nodes, index
+        except (ValueError, KeyError, json.JSONDecodeError):
+            pass
+
+    index = ReachabilityIndex.build(nodes)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_index(cache_path, nodes, index)
+    return nodes, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build reachability indexes for domain node graphs')
+    parser.add_argument('domains', nargs='*', help='Domains to index (default: all)')
+    parser.add_argument('--out', help='Directory to write <domain>.reach.json files to')
+    args = parser.parse_args()
+
+    domains = args.domains or list_domains()
+
+    print("=" * 60)
+    print("REACHABILITY INDEX")
+    print("=" * 60)
+
+    for domain in domains:
+        filepath = os.path.join(DOMAINS_DIR, domain, 'nodes.ts')
+        if not os.path.exists(filepath):
+            print(f"\n⚠️  Unknown domain: {domain}")
+            continue
+
+        nodes, index = load_or_build_index(domain, args.out)
+        comp_count = len(index.forward.post)
+        intervals = sum(len(s) for s in index.forward.starts)
+        cyclic = len(index.ids) - comp_count
+
+        print(f"\n{domain.upper()}")
+        print(f"  Nodes: {len(index.ids)}")
+        print(f"  Components: {comp_count}" + (f" ({cyclic} nodes folded into cycles)" if cyclic else ""))
+        print(f"  Descendant intervals per node: {intervals / max(comp_count, 1):.2f}")
+        if args.out:
+            print(f"  Saved: {os.path.join(args.out, domain + '.reach.json')}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
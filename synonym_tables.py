@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Compile DOMAIN_SYNONYMS and WORD_FORMS into flat lookup tables
+
+For each domain, synonym groups (key plus its synonyms) are merged with
+union-find into closed equivalence classes, and word forms are collapsed
+onto their lemma's class. The result is a flat token -> canonical ID table
+plus a token -> group IDs table that keeps queryMatcher.ts's exact
+(non-transitive) areSynonyms semantics, so a lookup is a dict access
+instead of a scan over every group.
+
+Also reports table problems: words that sit in more than one group (the
+closure merges those groups, the matcher does not), inflected forms used as
+synonyms, word-form chains, and synonyms that never occur in a node label.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from domain_config import DOMAINS_DIR, list_domains, load_domain_tables
+from validate_domains import extract_nodes_from_file
+
+TABLES_VERSION = 1
+DEFAULT_OUT_DIR = os.path.join('public', 'normalization')
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+
+def synonym_groups(synonyms):
+    """Groups as areSynonyms sees them: [key, *synonyms] per entry"""
+    return [[key] + list(values) for key, values in synonyms.items()]
+
+
+def groups_by_token(synonyms):
+    """token -> frozenset of group indices; two words are synonyms iff these intersect"""
+    by_token = {}
+    for index, group in enumerate(synonym_groups(synonyms)):
+        for word in group:
+            by_token.setdefault(word, set()).add(index)
+    return {word: frozenset(indices) for word, indices in by_token.items()}
+
+
+def compile_tables(synonyms, word_forms):
+    """Closed equivalence classes and flat lookup tables for one domain"""
+    groups = synonym_groups(synonyms)
+    uf = UnionFind()
+    for group in groups:
+        words = [word.lower() for word in group]
+        for word in words[1:]:
+            uf.union(words[0], word)
+
+    # Class IDs are the first word of the earliest group in each class
+    class_ids = {}
+    canonical = {}
+    for group in groups:
+        for word in group:
+            class_id = class_ids.setdefault(uf.find(word.lower()), group[0].lower())
+            canonical.setdefault(word.lower(), class_id)
+
+    # Every lemma maps to itself or its synonym class, then forms follow their lemma
+    lemmas = {form.lower(): lemma.lower() for form, lemma in word_forms.items()}
+    for lemma in lemmas.values():
+        canonical.setdefault(lemma, lemma)
+    for form, lemma in lemmas.items():
+        if form not in canonical:
+            canonical[form] = canonical[lemma]
+
+    unclosed = [token for token, class_id in canonical.items() if canonical.get(class_id) != class_id]
+    if unclosed:
+        raise ValueError(f"Canonical table is not closed for: {', '.join(sorted(unclosed))}")
+
+    classes = {}
+    for token, class_id in canonical.items():
+        classes.setdefault(class_id, []).append(token)
+
+    return {
+        'canonical': dict(sorted(canonical.items())),
+        'groups': {word: sorted(indices) for word, indices in sorted(groups_by_token(synonyms).items())},
+        'lemmas': dict(sorted(lemmas.items())),
+        'classes': {class_id: sorted(members) for class_id, members in sorted(classes.items())},
+    }
+
+
+def find_conflicts(synonyms, word_forms):
+    """Inconsistencies between synonym groups and word forms"""
+    conflicts = []
+    keys = list(synonyms)
+
+    owners = {}
+    for key, group in zip(keys, synonym_groups(synonyms)):
+        seen = set()
+        for word in group:
+            if word in seen:
+                conflicts.append(f"'{word}' is listed twice in the '{key}' group")
+            seen.add(word)
+            owners.setdefault(word, []).append(key)
+    for word, groups in owners.items():
+        if len(groups) > 1:
+            roles = [f"key of '{g}'" if g == word else f"synonym of '{g}'" for g in groups]
+            conflicts.append(f"'{word}' is {' and '.join(roles)}; closure merges {groups}")
+
+    for form, lemma in word_forms.items():
+        if lemma in word_forms and word_forms[lemma] != lemma:
+            conflicts.append(f"'{form}' -> '{lemma}' -> '{word_forms[lemma]}' is a chain; stem() does not follow it")
+        if form in owners and lemma in owners and not set(owners[form]) & set(owners[lemma]):
+            conflicts.append(f"'{form}' and its lemma '{lemma}' are in different synonym groups")
+    return conflicts
+
+
+def find_unused_synonyms(synonyms, nodes):
+    """Synonym words that never appear as a token of any node label"""
+    from query_matcher import tokenize
+
+    label_tokens = set()
+    for node in nodes.values():
+        label_tokens.update(tokenize(node.get('label', '')))
+    unused = []
+    for group in synonym_groups(synonyms):
+        for word in group:
+            if word.lower() not in label_tokens and word not in unused:
+                unused.append(word)
+    return unused
+
+
+def compile_domain(domain_name, nodes=None):
+    """Compiled tables plus conflict and unused-synonym findings for a domain"""
+    tables = load_domain_tables(domain_name)
+    if nodes is None:
+        nodes = extract_nodes_from_file(os.path.join(DOMAINS_DIR, domain_name, 'nodes.ts'))
+    compiled = compile_tables(tables['synonyms'], tables['word_forms'])
+    compiled.update({
+        'version': TABLES_VERSION,
+        'domain': domain_name,
+        'conflicts': find_conflicts(tables['synonyms'], tables['word_forms']),
+        'unused': find_unused_synonyms(tables['synonyms'], nodes),
+    })
+    return compiled
+
+
+def report_synonym_tables(compiled):
+    """Print conflicts and unused synonyms; returns True if there are no conflicts"""
+    name = compiled['domain']
+    print(f"{name.upper()}: {len(compiled['canonical'])} tokens in {len(compiled['classes'])} classes")
+    if compiled['conflicts']:
+        print(f"  ⚠️  {len(compiled['conflicts'])} conflicts:")
+        for conflict in compiled['conflicts']:
+            print(f"    - {conflict}")
+    else:
+        print("  ✓ No conflicts")
+    if compiled['unused']:
+        print(f"  ℹ️  {len(compiled['unused'])} synonyms never appear in a node label: {', '.join(compiled['unused'])}")
+    return not compiled['conflicts']
+
+
+def write_tables(compiled, out_dir=DEFAULT_OUT_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{compiled['domain']}.json")
+    payload = {key: compiled[key] for key in ('version', 'domain', 'canonical', 'groups', 'lemmas', 'classes')}
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile synonym and word-form tables and check their consistency')
+    parser.add_argument('domains', nargs='*', help='Domains to compile (default: all)')
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help=f'Output directory (default: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--check', action='store_true', help='Only report, do not write tables')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SYNONYM TABLE COMPILATION")
+    print("=" * 60)
+
+    for domain in args.domains or list_domains():
+        if not os.path.exists(os.path.join(DOMAINS_DIR, domain, 'domain.ts')):
+            print(f"\n⚠️  Unknown domain: {domain}")
+            continue
+        print()
+        compiled = compile_domain(domain)
+        report_synonym_tables(compiled)
+        if not args.check:
+            print(f"  Written: {write_tables(compiled, args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Tests for capability_index"""
+
+from capability_index import CapabilityIndex
+
+
+def cycle_domain(order):
+    """Two steps that are each other's child, plus a product and a shared rollup"""
+    nodes = {
+        'product-crm': {'label': 'CRM', 'level': 'product', 'children': ['step-plan-crm']},
+        'step-review-shared': {'label': 'Shared Review', 'level': 'step', 'children': []},
+        'step-plan-crm': {'label': 'Plan Work', 'level': 'step', 'children': ['step-review-crm']},
+        'step-review-crm': {'label': 'Review Work', 'level': 'step', 'children': ['step-plan-crm']},
+    }
+    return {node_id: nodes[node_id] for node_id in order}
+
+
+def test_skipped_nodes_are_not_interned():
+    index = CapabilityIndex()
+    index.add_domain('crm', cycle_domain(['product-crm', 'step-review-shared', 'step-plan-crm', 'step-review-crm']))
+    assert sorted(index.display.values()) == ['Plan Work', 'Review Work']
+
+
+def test_cycle_hashes_do_not_depend_on_traversal_start():
+    index = CapabilityIndex()
+    index.add_domain('a', cycle_domain(['product-crm', 'step-review-shared', 'step-plan-crm', 'step-review-crm']))
+    index.add_domain('b', cycle_domain(['step-review-crm', 'step-plan-crm', 'step-review-shared', 'product-crm']))
+    clusters = index.clusters(min_domains=2)
+    assert len(clusters) == 2
+    for cluster in clusters:
+        assert len(cluster['identical_subtrees']) == 1
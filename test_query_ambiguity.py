@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for query_ambiguity.classify"""
+
+import os
+
+import pytest
+
+from domain_config import DOMAINS_DIR
+from query_ambiguity import classify, load_matcher
+from query_matcher import QueryMatcher
+
+# financial's "view balance": four actions tie at 0.675, one from payments
+VIEW_BALANCE_NODES = {
+    'action-confirm-balance-cb': {'label': 'Confirm Balance', 'level': 'action', 'products': ['core-banking']},
+    'action-calculate-balance-cb': {'label': 'Calculate Balance', 'level': 'action', 'products': ['core-banking']},
+    'action-update-balance-payments': {'label': 'Update Balance', 'level': 'action', 'products': ['payments']},
+    'action-format-response-cb': {'label': 'Format Response', 'level': 'action', 'products': ['core-banking']},
+    'step-retrieve-balance-cb': {'label': 'Retrieve Balance', 'level': 'step', 'products': ['core-banking']},
+}
+
+
+class RankedMatcher(QueryMatcher):
+    """QueryMatcher that returns matches in the order they were given"""
+
+    def __init__(self, nodes, ranked):
+        super().__init__(nodes, product_codes=['cb', 'payments'])
+        self.ranked = ranked
+
+    def find_best_matches(self, text, top_n=5):
+        return self.ranked if top_n is None else self.ranked[:top_n]
+
+
+def test_tie_with_other_product_third_is_ambiguous():
+    ranked = [(node_id, 0.675, ['balance']) for node_id in list(VIEW_BALANCE_NODES)[:4]]
+    ranked.append(('step-retrieve-balance-cb', 0.625, ['balance']))
+    assert ranked[2][0] == 'action-update-balance-payments'
+
+    result = classify(RankedMatcher(VIEW_BALANCE_NODES, ranked), 'view balance')
+    assert result['label'] == 'ambiguous'
+    assert result['margin'] == 0
+
+
+def test_same_product_ties_are_clear():
+    ranked = [
+        ('action-confirm-balance-cb', 0.675, ['balance']),
+        ('action-calculate-balance-cb', 0.675, ['balance']),
+        ('action-update-balance-payments', 0.5, ['balance']),
+    ]
+    result = classify(RankedMatcher(VIEW_BALANCE_NODES, ranked), 'view balance')
+    assert result['label'] == 'clear'
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(DOMAINS_DIR, 'financial', 'nodes.ts')),
+                    reason='financial domain config not found')
+def test_view_balance_in_financial_is_ambiguous():
+    assert classify(load_matcher('financial'), 'view balance')['label'] == 'ambiguous'
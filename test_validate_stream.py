@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests for validate_stream.check_compact_graph"""
+
+from validate_stream import build_compact_graph, check_compact_graph
+
+# A workflow reuses an outcome that only lists its product as parent
+WORKFLOW_NODES_TS = """
+export const FUNCTIONAL_NODES: Record<string, FunctionalNode> = {
+  'product-crm': {
+    id: 'product-crm',
+    label: 'CRM',
+    level: 'product',
+    children: ['outcome-sales-crm'],
+    parents: []
+  },
+  'workflow-onboarding': {
+    id: 'workflow-onboarding',
+    label: 'Onboarding',
+    level: 'workflow',
+    children: ['outcome-sales-crm'],
+    parents: []
+  },
+  'outcome-sales-crm': {
+    id: 'outcome-sales-crm',
+    label: 'Sales',
+    level: 'outcome',
+    children: [],
+    parents: ['product-crm']
+  },
+};
+"""
+
+
+def check(text):
+    return check_compact_graph(build_compact_graph(text.splitlines()))
+
+
+def test_workflow_outcome_child_is_not_asymmetric():
+    findings = check(WORKFLOW_NODES_TS)
+    assert findings['asymmetric'] == []
+    assert findings['level_errors'] == []
+
+
+def test_product_outcome_child_must_list_parent():
+    findings = check(WORKFLOW_NODES_TS.replace("parents: ['product-crm']", "parents: []"))
+    assert findings['asymmetric'] == ['outcome-sales-crm is a child of product-crm but does not list it as parent']
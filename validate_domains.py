@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
 """Validate domain nodes for product tree independence and shared node marking"""
 
+import argparse
 import re
 import sys
 import os
 from collections import defaultdict
 
+from reachability_index import ReachabilityIndex
+
+# Bump when a check is added or its pass/fail rules change; part of the
+# result cache key used by --cache
+RULESET_VERSION = 2
+
 def extract_nodes_from_file(filepath):
     """Extract node definitions from TypeScript file"""
     with open(filepath, 'r') as f:
         content = f.read()
     
+    return extract_nodes_from_text(content)
+
+def extract_nodes_from_text(content):
+    """Extract node definitions from TypeScript source text"""
     # Find all node definitions
     nodes = {}
     pattern = r"'([^']+)':\s*\{[^}]*id:\s*'([^']+)'[^}]*label:\s*'([^']+)'[^}]*level:\s*'([^']+)'[^}]*(?:products:\s*\[([^\]]*)\])?[^}]*(?:children:\s*\[([^\]]*)\])?[^}]*(?:parents:\s*\[([^\]]*)\])?[^}]*\}"
@@ -53,6 +64,9 @@ def extract_nodes_from_file(filepath):
                 if match := re.search(r"parents:\s*\[([^\]]*)\]", line):
                     parents = match.group(1)
                     current_data['parents'] = [p.strip().strip("'\"") for p in parents.split(',') if p.strip()]
+            elif 'description:' in line:
+                if match := re.search(r"description:\s*'([^']+)'", line):
+                    current_data['description'] = match.group(1)
     
     # Add last node
     if current_node:
@@ -60,8 +74,11 @@ def extract_nodes_from_file(filepath):
     
     return nodes
 
-def check_product_independence(nodes, domain_name):
+def check_product_independence(nodes, domain_name, index=None):
     """Check if product trees are independent (excluding workflow and shared nodes)"""
+    if index is None:
+        index = ReachabilityIndex.build(nodes)
+
     # Extract product names from the nodes
     products = []
     for node_id, node in nodes.items():
@@ -69,51 +86,36 @@ def check_product_independence(nodes, domain_name):
             product_name = node_id.replace('product-', '')
             products.append(product_name)
     
-    product_trees = {}
-    
-    # Build reachability for each product
-    for product in products:
-        product_node = f'product-{product}'
-        if product_node not in nodes:
+    # Collect nodes reached by more than one product, one index lookup per product
+    reached_by = defaultdict(set)
+    for node_id, node in nodes.items():
+        # Skip if it's a workflow node (intentionally cross-product)
+        if node.get('level') == 'workflow':
             continue
-        
-        reachable = set()
-        to_visit = [product_node]
-        
-        while to_visit:
-            current = to_visit.pop()
-            if current in reachable:
-                continue
-            reachable.add(current)
-            
-            if current in nodes and 'children' in nodes[current]:
-                to_visit.extend(nodes[current]['children'])
-        
-        product_trees[product] = reachable
-    
+        # Skip if it's properly marked as shared/unified (rationalized)
+        if '-shared' in node_id or '-unified' in node_id:
+            continue
+        for product in products:
+            if index.reaches(f'product-{product}', node_id):
+                reached_by[node_id].add(product)
+
+    # Dangling child references are reached by whatever reaches their parent
+    for node_id, node in nodes.items():
+        for child in node.get('children', []):
+            if child not in nodes and '-shared' not in child and '-unified' not in child:
+                for product in products:
+                    if index.reaches(f'product-{product}', node_id):
+                        reached_by[child].add(product)
+
     # Check for overlaps
     overlaps = []
     for i, prod1 in enumerate(products):
-        if prod1 not in product_trees:
-            continue
         for prod2 in products[i+1:]:
-            if prod2 not in product_trees:
-                continue
-            
-            # Find overlapping nodes
-            overlap = []
-            for node in product_trees[prod1]:
-                if node in product_trees[prod2]:
-                    node_obj = nodes.get(node, {})
-                    # Skip if it's a workflow node (intentionally cross-product)
-                    if node_obj.get('level') == 'workflow':
-                        continue
-                    # Skip if it's properly marked as shared/unified (rationalized)
-                    if '-shared' in node or '-unified' in node:
-                        continue
-                    # This is an improper overlap
-                    overlap.append(node)
-            
+            # This is an improper overlap
+            overlap = [
+                node_id for node_id, reached in reached_by.items()
+                if prod1 in reached and prod2 in reached
+            ]
             if overlap:
                 overlaps.append((prod1, prod2, overlap))
     
@@ -144,6 +146,41 @@ def validate_references(nodes):
     
     return errors
 
+def check_query_references(queries, nodes):
+    """Check USER_QUERIES entry nodes exist and sit at the declared entry level"""
+    errors = []
+    for query in queries:
+        entry_node = query.get('entryNode')
+        if not entry_node:
+            continue
+        if entry_node not in nodes:
+            errors.append(f"Query {query['id']} (line {query['line']}) references non-existent node: {entry_node}")
+        elif query.get('entryLevel') and nodes[entry_node].get('level') != query['entryLevel']:
+            errors.append(
+                f"Query {query['id']} (line {query['line']}) declares entryLevel '{query['entryLevel']}' "
+                f"but {entry_node} is a {nodes[entry_node].get('level')}"
+            )
+    return errors
+
+def check_context_references(refs, nodes, product_codes):
+    """Check SAMPLE_CONTEXTS history nodes exist and products are known
+
+    Returns (errors, warnings): dangling history nodes are errors, unknown
+    products in history or productPreferences are warnings.
+    """
+    errors = []
+    warnings = []
+    known_products = set(product_codes)
+    for ref in refs:
+        where = f"Context {ref['context']} (line {ref['line']})"
+        if ref['kind'] == 'history-node':
+            if ref['value'] not in nodes:
+                errors.append(f"{where} history references non-existent node: {ref['value']}")
+        elif ref['value'] not in known_products:
+            source = 'history' if ref['kind'] == 'history-product' else 'productPreferences'
+            warnings.append(f"{where} {source} references unknown product: {ref['value']}")
+    return errors, warnings
+
 def check_shared_nodes_validity(nodes):
     """Check that shared nodes properly represent rationalized duplicates
     
@@ -269,18 +306,24 @@ def check_shared_nodes_validity(nodes):
     
     return errors
 
-def validate_domain(domain_name):
-    """Validate a specific domain"""
-    filepath = f'src/config/domains/{domain_name}/nodes.ts'
+def validate_domain(domain_name, nodes=None, filepath=None):
+    """Validate a specific domain
     
-    if not os.path.exists(filepath):
+    Pass already parsed nodes to skip reading the domain's nodes.ts, or a
+    filepath to validate a nodes.ts outside src/config/domains. queries.ts,
+    contexts.ts and domain.ts are read from the same directory.
+    """
+    filepath = filepath or f'src/config/domains/{domain_name}/nodes.ts'
+    
+    if nodes is None and not os.path.exists(filepath):
         print(f"Domain '{domain_name}' not found at {filepath}")
         return False
     
     print(f"\nValidating {domain_name.upper()} Domain...")
     print("=" * 60)
     
-    nodes = extract_nodes_from_file(filepath)
+    if nodes is None:
+        nodes = extract_nodes_from_file(filepath)
     
     if not nodes:
         print("ERROR: Could not extract nodes from file")
@@ -327,6 +370,40 @@ def validate_domain(domain_name):
     else:
         print("  ✓ All references valid")
     
+    # Validate queries.ts and contexts.ts against the node index
+    print(f"\nValidating query and context references...")
+    query_errors = []
+    domain_dir = os.path.dirname(filepath)
+    if os.path.exists(os.path.join(domain_dir, 'queries.ts')):
+        from domain_config import extract_queries_from_file
+        queries = extract_queries_from_file(os.path.join(domain_dir, 'queries.ts'))
+        query_errors.extend(check_query_references(queries, nodes))
+    context_warnings = []
+    if os.path.exists(os.path.join(domain_dir, 'contexts.ts')):
+        from domain_config import extract_context_refs_from_file, extract_product_codes
+        product_codes = []
+        if os.path.exists(os.path.join(domain_dir, 'domain.ts')):
+            with open(os.path.join(domain_dir, 'domain.ts'), 'r') as f:
+                product_codes = extract_product_codes(f.read())
+        context_errors, context_warnings = check_context_references(
+            extract_context_refs_from_file(os.path.join(domain_dir, 'contexts.ts')), nodes, product_codes
+        )
+        query_errors.extend(context_errors)
+    if query_errors:
+        print(f"  ⚠️  Found {len(query_errors)} query/context reference errors:")
+        for error in query_errors[:5]:
+            print(f"    - {error}")
+        if len(query_errors) > 5:
+            print(f"    ... and {len(query_errors) - 5} more")
+    if context_warnings:
+        print(f"  ⚠️  {len(context_warnings)} unknown product references:")
+        for warning in context_warnings[:5]:
+            print(f"    - {warning}")
+        if len(context_warnings) > 5:
+            print(f"    ... and {len(context_warnings) - 5} more")
+    if not query_errors and not context_warnings:
+        print("  ✓ All query and context references valid")
+    
     # Check product independence and shared node marking
     print(f"\nChecking product tree independence and shared node marking...")
     overlaps = check_product_independence(nodes, domain_name)
@@ -354,12 +431,13 @@ def validate_domain(domain_name):
             print("  ✓ All product trees are independent (no shared nodes)")
     
     print("\n" + "=" * 60)
-    success = not orphaned and not ref_errors and not overlaps
+    success = not orphaned and not ref_errors and not overlaps and not query_errors
     if success:
         print(f"✅ {domain_name.upper()} domain validation PASSED")
     else:
         print(f"❌ {domain_name.upper()} domain validation FAILED")
-        print(f"   Issues: {len(orphaned)} orphaned, {len(ref_errors)} ref errors, {len(overlaps)} improper overlaps")
+        print(f"   Issues: {len(orphaned)} orphaned, {len(ref_errors)} ref errors, "
+              f"{len(query_errors)} query/context ref errors, {len(overlaps)} improper overlaps")
     
     return success
 
@@ -368,11 +446,19 @@ def main():
     # Default domains to test
     all_domains = ['cision', 'healthcare', 'ecommerce', 'enterprise', 'financial']
     
-    # Check if specific domains were provided as arguments
-    if len(sys.argv) > 1:
-        domains_to_test = sys.argv[1:]
-    else:
-        domains_to_test = all_domains
+    parser = argparse.ArgumentParser(description='Validate domain node graphs')
+    parser.add_argument('domains', nargs='*', help='Domains to validate (default: all)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Reuse results for domains whose input files are unchanged')
+    parser.add_argument('--cache-max-mb', type=float, default=16,
+                        help='Prune the cache to this size after the run (default: 16)')
+    args = parser.parse_args()
+    domains_to_test = args.domains or all_domains
+    
+    cache = None
+    if args.cache:
+        from validation_cache import ResultCache, domain_key
+        cache = ResultCache(args.cache, int(args.cache_max_mb * 1024 * 1024))
     
     print("=" * 60)
     print("DOMAIN VALIDATION TOOL")
@@ -383,8 +469,19 @@ def main():
         if domain not in all_domains:
             print(f"\n⚠️  Unknown domain: {domain}")
             continue
-        results[domain] = validate_domain(domain)
+        if cache:
+            results[domain] = cache.run(domain_key(domain, RULESET_VERSION), validate_domain, domain)
+        else:
+            results[domain] = validate_domain(domain)
     
+    if cache:
+        cache.prune()
+        print(f"\nResult cache: {cache.hits} reused, {cache.misses} validated")
+    
+    return print_validation_summary(results)
+
+def print_validation_summary(results):
+    """Print the per-domain summary table and return the exit status"""
     # Summary
     print("\n" + "=" * 60)
     print("VALIDATION SUMMARY")
@@ -2,6 +2,7 @@
 """Validate healthcare domain nodes"""
 
 import re
+import sys
 from collections import defaultdict
 
 def extract_nodes_from_file(filepath):
@@ -49,9 +50,17 @@ def extract_nodes_from_file(filepath):
     
     return nodes
 
-def check_shared_node_validity(nodes):
-    """Check shared node validity"""
-    products = ['ehr', 'pharmacy']
+def check_shared_node_validity(nodes, products=None):
+    """Check shared node validity
+    
+    products defaults to every product node in the graph.
+    """
+    if products is None:
+        products = [
+            node_id.replace('product-', '')
+            for node_id, node in nodes.items()
+            if node.get('level') == 'product'
+        ]
     product_trees = {}
     
     # Build reachability for each product
@@ -111,17 +120,14 @@ def check_shared_node_validity(nodes):
     
     return errors, warnings, shared_nodes
 
-def main():
-    filepath = 'src/config/domains/healthcare/nodes.ts'
-    
-    print("Validating Healthcare Domain...")
+def report_rationalization(nodes, domain_name):
+    """Print shared node validity for a domain; returns True if it passed"""
+    print(f"Validating {domain_name.capitalize()} Domain...")
     print("=" * 60)
     
-    nodes = extract_nodes_from_file(filepath)
-    
     if not nodes:
         print("ERROR: Could not extract nodes from file")
-        return
+        return False
     
     # Count nodes
     total = len(nodes)
@@ -151,11 +157,19 @@ def main():
     
     print("\n" + "=" * 60)
     if not errors:
-        print(f"✅ Healthcare domain validation PASSED")
+        print(f"✅ {domain_name.capitalize()} domain validation PASSED")
         print(f"   {len(shared_nodes)} nodes properly connecting multiple products")
     else:
-        print(f"❌ Healthcare domain validation FAILED")
+        print(f"❌ {domain_name.capitalize()} domain validation FAILED")
         print(f"   {len(errors)} errors found")
+    
+    return not errors
+
+def main():
+    domains = sys.argv[1:] or ['healthcare']
+    for domain in domains:
+        nodes = extract_nodes_from_file(f'src/config/domains/{domain}/nodes.ts')
+        report_rationalization(nodes, domain)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
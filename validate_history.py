@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Track domain validation metrics across git history
+
+Lists every revision that touched src/config/domains/*/nodes.ts, streams the
+changed blobs through a single `git cat-file --batch` process and validates
+them in a worker pool. Blobs are keyed by their git object id (a content
+hash), so content that reappears across revisions is validated once.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import re
+import subprocess
+import sys
+import time
+
+from find_duplicates import find_duplicates
+from validate_domains import (
+    check_product_independence,
+    extract_nodes_from_text,
+    find_orphaned_nodes,
+    validate_references,
+)
+
+NODES_PATHSPEC = 'src/config/domains/*/nodes.ts'
+NODES_PATH_RE = re.compile(r'^src/config/domains/([^/]+)/nodes\.ts$')
+NULL_BLOB = '0' * 40
+
+FIELDS = [
+    'commit', 'timestamp', 'domain', 'blob', 'nodes', 'orphans',
+    'ref_errors', 'overlaps', 'duplicate_groups', 'validate_ms',
+]
+
+
+def list_revisions(repo='.', rev_range='HEAD'):
+    """Yield (commit, timestamp, domain, blob) for each nodes.ts change, oldest first"""
+    cmd = [
+        'git', '-C', repo, 'log', '--reverse', '--no-renames', '--raw', '--no-abbrev',
+        '--format=@%H %ct', rev_range, '--', NODES_PATHSPEC,
+    ]
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+
+    commit = timestamp = None
+    for line in output.splitlines():
+        if line.startswith('@'):
+            commit, timestamp = line[1:].split()
+            timestamp = int(timestamp)
+        elif line.startswith(':'):
+            meta, path = line.split('\t', 1)
+            blob = meta.split()[3]
+            match = NODES_PATH_RE.match(path)
+            if match and blob != NULL_BLOB:
+                yield commit, timestamp, match.group(1), blob
+
+
+class BlobReader:
+    """Long-lived `git cat-file --batch` process"""
+
+    def __init__(self, repo='.'):
+        self.process = subprocess.Popen(
+            ['git', '-C', repo, 'cat-file', '--batch'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def read(self, blob):
+        self.process.stdin.write(blob.encode('ascii') + b'\n')
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().decode('ascii').split()
+        if len(header) < 3 or header[1] == 'missing':
+            raise ValueError(f"Blob not found: {blob}")
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # trailing newline
+        return data.decode('utf-8', errors='replace')
+
+    def stream(self, blobs):
+        """Yield (blob, text) for each blob id"""
+        for blob in blobs:
+            yield blob, self.read(blob)
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def validate_blob(item):
+    """Worker: parse and validate one nodes.ts blob"""
+    blob, content = item
+    start = time.perf_counter()
+    nodes = extract_nodes_from_text(content)
+    metrics = {
+        'nodes': len(nodes),
+        'orphans': len(find_orphaned_nodes(nodes)),
+        'ref_errors': len(validate_references(nodes)),
+        'overlaps': len(check_product_independence(nodes, None)),
+        'duplicate_groups': len(find_duplicates(nodes)),
+    }
+    metrics['validate_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return blob, metrics
+
+
+def collect_history(repo='.', rev_range='HEAD', workers=None):
+    """Return one metrics row per (revision, domain) change"""
+    revisions = list(list_revisions(repo, rev_range))
+    unique_blobs = list(dict.fromkeys(blob for _, _, _, blob in revisions))
+
+    results = {}
+    if unique_blobs:
+        with BlobReader(repo) as reader, multiprocessing.Pool(workers) as pool:
+            for blob, metrics in pool.imap_unordered(validate_blob, reader.stream(unique_blobs), chunksize=4):
+                results[blob] = metrics
+
+    rows = []
+    for commit, timestamp, domain, blob in revisions:
+        row = {'commit': commit, 'timestamp': timestamp, 'domain': domain, 'blob': blob}
+        row.update(results[blob])
+        rows.append(row)
+    return rows, len(unique_blobs)
+
+
+def write_rows(rows, out, fmt):
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate every historical revision of domain nodes.ts files')
+    parser.add_argument('rev_range', nargs='?', default='HEAD', help='Revision range to scan (default: HEAD)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv', help='Output format (default: csv)')
+    parser.add_argument('--out', help='Output file (default: stdout)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--repo', default='.', help='Repository path (default: current directory)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows, unique = collect_history(args.repo, args.rev_range, args.workers)
+
+    if args.out:
+        with open(args.out, 'w', newline='') as f:
+            write_rows(rows, f, args.format)
+    else:
+        write_rows(rows, sys.stdout, args.format)
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} revisions, {unique} unique blobs validated in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Bounded-memory two-pass validation for very large generated domains
+
+Pass 1 reads nodes.ts line by line and keeps only interned node IDs, level
+codes and flat child/parent edge arrays. Pass 2 checks references, orphans,
+parent/child symmetry and level rules against those tables. Labels and
+products are only kept when duplicate detection is requested, so peak
+memory follows the node count rather than the file size.
+"""
+
+import argparse
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+from domain_config import DOMAINS_DIR
+
+LEVELS = ['product', 'workflow', 'outcome', 'scenario', 'step', 'action']
+UNKNOWN_LEVEL = 255
+
+# Allowed child levels for each parent level
+ALLOWED_CHILD_LEVELS = {
+    'product': {'outcome', 'workflow'},
+    'workflow': {'outcome'},
+    'outcome': {'scenario'},
+    'scenario': {'step'},
+    'step': {'action'},
+    'action': set(),
+}
+
+NODE_START_RE = re.compile(r"\s*'([^']+)':\s*\{")
+LABEL_RE = re.compile(r"label:\s*'([^']+)'")
+LEVEL_RE = re.compile(r"level:\s*'([^']+)'")
+LIST_RE = {
+    key: re.compile(key + r":\s*\[([^\]]*)\]")
+    for key in ('products', 'children', 'parents')
+}
+
+
+def _split_list(text):
+    return [item.strip().strip("'\"") for item in text.split(',') if item.strip()]
+
+
+def iter_node_records(lines, keep_labels=False):
+    """Yield one node dict at a time from nodes.ts lines
+
+    Same line rules as extract_nodes_from_text, but only the current node
+    is held in memory. Labels and products are dropped unless keep_labels.
+    """
+    in_nodes = False
+    current = None
+
+    for line in lines:
+        if not in_nodes:
+            in_nodes = 'export const FUNCTIONAL_NODES' in line
+            continue
+
+        if match := NODE_START_RE.match(line):
+            if current is not None:
+                yield current
+            current = {'id': match.group(1), 'children': [], 'parents': []}
+            if keep_labels:
+                current['products'] = []
+        elif current is not None:
+            if 'label:' in line:
+                if keep_labels and (match := LABEL_RE.search(line)):
+                    current['label'] = match.group(1)
+            elif 'level:' in line:
+                if match := LEVEL_RE.search(line):
+                    current['level'] = match.group(1)
+            elif 'products:' in line:
+                if keep_labels and (match := LIST_RE['products'].search(line)):
+                    current['products'] = _split_list(match.group(1))
+            elif 'children:' in line:
+                if match := LIST_RE['children'].search(line):
+                    current['children'] = _split_list(match.group(1))
+            elif 'parents:' in line:
+                if match := LIST_RE['parents'].search(line):
+                    current['parents'] = _split_list(match.group(1))
+
+    if current is not None:
+        yield current
+
+
+class CompactGraph:
+    """Interned node table with flat CSR-style edge arrays"""
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.defined = bytearray()
+        self.levels = bytearray()
+        self.child_offsets = array('I', [0])
+        self.children = array('I')
+        self.parent_offsets = array('I', [0])
+        self.parents = array('I')
+        self.definition_order = array('I')
+        self.label_groups = None
+        self.products = None
+
+    def intern(self, node_id):
+        i = self.index.get(node_id)
+        if i is None:
+            i = len(self.ids)
+            self.ids.append(sys.intern(node_id))
+            self.index[self.ids[i]] = i
+            self.defined.append(0)
+            self.levels.append(UNKNOWN_LEVEL)
+        return i
+
+    def add(self, record):
+        i = self.intern(record['id'])
+        self.defined[i] = 1
+        level = record.get('level')
+        self.levels[i] = LEVELS.index(level) if level in LEVELS else UNKNOWN_LEVEL
+        self.definition_order.append(i)
+        self.children.extend(self.intern(c) for c in record['children'])
+        self.child_offsets.append(len(self.children))
+        self.parents.extend(self.intern(p) for p in record['parents'])
+        self.parent_offsets.append(len(self.parents))
+
+        if self.label_groups is not None and 'label' in record:
+            key = (self.levels[i], record['label'].lower())
+            self.label_groups[key].append(i)
+            self.products[i] = frozenset(record.get('products', []))
+
+    def edges(self, offsets, targets, k):
+        """Edge targets for the k-th defined node"""
+        return targets[offsets[k]:offsets[k + 1]]
+
+    def level_name(self, i):
+        level = self.levels[i]
+        return LEVELS[level] if level != UNKNOWN_LEVEL else None
+
+
+def build_compact_graph(lines, keep_labels=False):
+    """Pass 1: intern IDs, levels and edges from a line iterator"""
+    graph = CompactGraph()
+    if keep_labels:
+        graph.label_groups = defaultdict(list)
+        graph.products = {}
+    for record in iter_node_records(lines, keep_labels):
+        graph.add(record)
+    return graph
+
+
+def _sorted_rows(offsets, targets):
+    """Copy of an edge array with each node's slice sorted"""
+    result = array(targets.typecode, targets)
+    for k in range(len(offsets) - 1):
+        lo, hi = offsets[k], offsets[k + 1]
+        if hi - lo > 1:
+            result[lo:hi] = array(targets.typecode, sorted(result[lo:hi]))
+    return result
+
+
+def check_compact_graph(graph):
+    """Pass 2: reference, orphan, symmetry and level checks"""
+    ids = graph.ids
+    findings = {
+        'ref_errors': [],
+        'orphans': [],
+        'asymmetric': [],
+        'level_errors': [],
+    }
+
+    # Row of each defined node, and per-row sorted copies of the edge arrays
+    # so symmetry checks are a bisect within the other node's slice
+    row = array('i', [-1]) * len(ids)
+    for k, i in enumerate(graph.definition_order):
+        row[i] = k
+    sorted_children = _sorted_rows(graph.child_offsets, graph.children)
+    sorted_parents = _sorted_rows(graph.parent_offsets, graph.parents)
+
+    def has_edge(offsets, targets, node, target):
+        lo, hi = offsets[row[node]], offsets[row[node] + 1]
+        pos = bisect_left(targets, target, lo, hi)
+        return pos < hi and targets[pos] == target
+
+    for k, i in enumerate(graph.definition_order):
+        node_id = ids[i]
+        level = graph.level_name(i)
+        children = graph.edges(graph.child_offsets, graph.children, k)
+        parents = graph.edges(graph.parent_offsets, graph.parents, k)
+
+        if level is None:
+            findings['level_errors'].append(f"Node {node_id} has unknown level")
+        elif level not in ('product', 'workflow') and not parents:
+            findings['orphans'].append(node_id)
+
+        for p in parents:
+            if ids[p] and not graph.defined[p]:
+                findings['ref_errors'].append(f"Node {node_id} references non-existent parent: {ids[p]}")
+
+        allowed = ALLOWED_CHILD_LEVELS.get(level, set())
+        for c in children:
+            if not graph.defined[c]:
+                if not ids[c]:
+                    continue
+                findings['ref_errors'].append(f"Node {node_id} references non-existent child: {ids[c]}")
+                continue
+            child_level = graph.level_name(c)
+            if level is not None and child_level is not None and child_level not in allowed:
+                findings['level_errors'].append(
+                    f"Node {node_id} ({level}) has {child_level} child: {ids[c]}"
+                )
+            # Workflows deliberately keep an empty parents list, and outcomes
+            # do not list the workflows that reuse them
+            if (child_level != 'workflow' and level != 'workflow'
+                    and not has_edge(graph.parent_offsets, sorted_parents, c, i)):
+                findings['asymmetric'].append(f"{ids[c]} is a child of {node_id} but does not list it as parent")
+
+        for p in parents:
+            if graph.defined[p] and not has_edge(graph.child_offsets, sorted_children, p, i):
+                findings['asymmetric'].append(f"{ids[i]} lists parent {ids[p]} which does not list it as child")
+
+    return findings
+
+
+def find_label_duplicates(graph):
+    """Duplicate groups (same level and label, different products)"""
+    if graph.label_groups is None:
+        return []
+    groups = []
+    for (level, label), members in graph.label_groups.items():
+        if level == LEVELS.index('workflow') or len(members) < 2:
+            continue
+        members = [i for i in members if '-shared' not in graph.ids[i] and '-unified' not in graph.ids[i]]
+        if len(members) < 2:
+            continue
+        product_sets = [graph.products[i] for i in members]
+        if any(s != product_sets[0] for s in product_sets[1:]):
+            groups.append((LEVELS[level] if level != UNKNOWN_LEVEL else None, label, [graph.ids[i] for i in members]))
+    return groups
+
+
+def stream_validate(filepath, duplicates=False):
+    """Validate a nodes.ts file in two passes; returns (graph, findings)"""
+    with open(filepath, 'r') as f:
+        graph = build_compact_graph(f, keep_labels=duplicates)
+    findings = check_compact_graph(graph)
+    if duplicates:
+        findings['duplicates'] = find_label_duplicates(graph)
+    return graph, findings
+
+
+def report_stream_validation(filepath, name, duplicates=False):
+    """Print streaming validation results; returns True if it passed"""
+    print(f"\nStream-validating {name}...")
+    print("=" * 60)
+
+    graph, findings = stream_validate(filepath, duplicates)
+    defined = len(graph.definition_order)
+    if not defined:
+        print("ERROR: Could not extract nodes from file")
+        return False
+
+    print(f"  Nodes: {defined} ({len(graph.ids) - defined} referenced but undefined)")
+    print(f"  Edges: {len(graph.children)} child, {len(graph.parents)} parent")
+
+    titles = [
+        ('orphans', 'orphaned nodes'),
+        ('ref_errors', 'reference errors'),
+        ('asymmetric', 'asymmetric parent/child links'),
+        ('level_errors', 'level rule violations'),
+    ]
+    for key, title in titles:
+        items = findings[key]
+        if items:
+            print(f"  ⚠️  {len(items)} {title}:")
+            for item in items[:5]:
+                print(f"    - {item}")
+            if len(items) > 5:
+                print(f"    ... and {len(items) - 5} more")
+        else:
+            print(f"  ✓ No {title}")
+
+    if duplicates:
+        print(f"  ℹ️  {len(findings['duplicates'])} duplicate groups")
+        for level, label, members in findings['duplicates'][:5]:
+            print(f"    - '{label}' at {level}: {members}")
+
+    success = not findings['orphans'] and not findings['ref_errors']
+    print(f"{'✅' if success else '❌'} {name} stream validation {'PASSED' if success else 'FAILED'}")
+    return success
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Two-pass bounded-memory validation of nodes.ts files')
+    parser.add_argument('targets', nargs='+', help='Domain names or paths to nodes.ts files')
+    parser.add_argument('--duplicates', action='store_true', help='Also detect duplicate labels (keeps labels in memory)')
+    args = parser.parse_args()
+
+    failed = 0
+    for target in args.targets:
+        filepath = target if os.path.isfile(target) else os.path.join(DOMAINS_DIR, target, 'nodes.ts')
+        if not os.path.exists(filepath):
+            print(f"\n⚠️  Not found: {target}")
+            failed += 1
+            continue
+        if not report_stream_validation(filepath, target, args.duplicates):
+            failed += 1
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of domain validation results
+
+A domain's key hashes its input files (nodes, queries, contexts, domain
+config), the validator's rule-set version and the validator sources
+themselves. On a hit the stored report is replayed and its pass/fail status
+returned without parsing anything. Entries are JSON files whose mtime is
+refreshed on every hit, and the directory is pruned oldest-first once it
+grows past its size bound.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+
+from domain_config import DOMAINS_DIR
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = '.validation-cache'
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+INPUT_FILES = ['nodes.ts', 'queries.ts', 'contexts.ts', 'domain.ts']
+VALIDATOR_SOURCES = ['validate_domains.py', 'domain_config.py', 'reachability_index.py']
+
+
+def _update_with_file(digest, label, path):
+    digest.update(f'{label}\0'.encode('utf-8'))
+    if not os.path.exists(path):
+        digest.update(b'missing\0')
+        return
+    with open(path, 'rb') as f:
+        content = f.read()
+    digest.update(f'{len(content)}\0'.encode('utf-8'))
+    digest.update(content)
+
+
+def domain_key(domain_name, ruleset_version):
+    """Cache key for a domain's inputs under a given rule set"""
+    digest = hashlib.sha256(f'{CACHE_VERSION}\0{ruleset_version}\0{domain_name}\0'.encode('utf-8'))
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in VALIDATOR_SOURCES:
+        _update_with_file(digest, name, os.path.join(here, name))
+    for name in INPUT_FILES:
+        _update_with_file(digest, name, os.path.join(DOMAINS_DIR, domain_name, name))
+    return digest.hexdigest()
+
+
+class _Tee(io.TextIOBase):
+    """Write to the real stream while keeping a copy"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class ResultCache:
+    """Directory of <key>.json result files with size-bounded LRU pruning"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get('version') != CACHE_VERSION or entry.get('key') != key:
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key, result):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = dict(result, version=CACHE_VERSION, key=key)
+        tmp = self._path(key) + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._path(key))
+
+    def run(self, key, func, *args, **kwargs):
+        """Replay a cached report for key, or run func and cache its output
+
+        func prints its report and returns a truthy pass/fail status.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            sys.stdout.write(entry['output'])
+            return entry['success']
+
+        self.misses += 1
+        tee = _Tee(sys.stdout)
+        with contextlib.redirect_stdout(tee):
+            success = bool(func(*args, **kwargs))
+        self.put(key, {'success': success, 'output': tee.buffer.getvalue()})
+        return success
+
+    def prune(self):
+        """Delete least recently used entries until under max_bytes; returns count removed"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prune or clear the validation result cache')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_DIR, help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help='Size bound in MB (default: %(default)s)')
+    parser.add_argument('--clear', action='store_true', help='Remove every entry')
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache, 0 if args.clear else int(args.max_mb * 1024 * 1024))
+    removed = cache.prune()
+    print(f"Removed {removed} cache entries from {args.cache}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())